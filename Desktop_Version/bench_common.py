@@ -0,0 +1,151 @@
+"""Helpers shared by the OCR and TTS benchmarks (ocr_bench.py, tts_bench.py).
+
+Standard library only, so the TTS benchmark runs on machines without
+OpenCV, numpy or Pillow: descriptive statistics with bootstrap confidence
+intervals, the machine description stored with results, and the French,
+English and Arabic test texts.
+"""
+import os
+import platform
+import random
+import statistics
+import sys
+
+BOOTSTRAP_ROUNDS = 2000
+
+
+# ----------------------------------------------------------------------
+# Statistics
+# ----------------------------------------------------------------------
+
+def percentile(values, q):
+    """q-th percentile with linear interpolation (numpy's default method)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100.0
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return float(ordered[low] + (ordered[high] - ordered[low]) * (rank - low))
+
+
+def bootstrap_ci(values, stat=statistics.median, level=0.95, rounds=BOOTSTRAP_ROUNDS, seed=0):
+    """Percentile bootstrap confidence interval of stat(values)"""
+    if len(values) < 2:
+        return [None, None]
+    rng = random.Random(seed)
+    estimates = sorted(stat(rng.choices(values, k=len(values))) for _ in range(rounds))
+    lo = estimates[int((1 - level) / 2 * rounds)]
+    hi = estimates[int((1 + level) / 2 * rounds) - 1]
+    return [lo, hi]
+
+
+def summarize(values):
+    """Descriptive statistics + 95% CI of the median"""
+    if not values:
+        return {'n': 0}
+    return {
+        'n': len(values),
+        'mean': statistics.fmean(values),
+        'median': statistics.median(values),
+        'stdev': statistics.stdev(values) if len(values) > 1 else 0.0,
+        'min': min(values),
+        'max': max(values),
+        'p90': percentile(values, 90),
+        'p95': percentile(values, 95),
+        'median_ci95': bootstrap_ci(values),
+    }
+
+
+def paired_bootstrap_ci(pairs, stat, level=0.95, rounds=BOOTSTRAP_ROUNDS, seed=0):
+    """Percentile bootstrap CI of stat(pairs), resampling whole pairs.
+
+    Each pair holds the current and baseline measurement of the same
+    image, so the large differences between images cancel out.
+    """
+    if len(pairs) < 2:
+        return [None, None]
+    rng = random.Random(seed)
+    estimates = sorted(stat(rng.choices(pairs, k=len(pairs))) for _ in range(rounds))
+    return [estimates[int((1 - level) / 2 * rounds)], estimates[int((1 + level) / 2 * rounds) - 1]]
+
+
+def median_ratio(pairs):
+    """Median of the per-image ratios current / baseline"""
+    return statistics.median(cur / base for cur, base in pairs)
+
+
+def pooled_delta(pairs):
+    """Difference of pooled rates: sum(edits) / sum(chars), current minus baseline"""
+    chars = sum(p[2] for p in pairs) or 1
+    return (sum(p[0] for p in pairs) - sum(p[1] for p in pairs)) / chars
+
+
+def environment(modules=('numpy', 'PIL', 'cv2', 'torch', 'easyocr', 'pytesseract', 'doctr')):
+    """Machine/software description stored with every result file.
+
+    Versions are listed for the modules already imported; nothing is
+    imported here.
+    """
+    versions = {}
+    for module in modules:
+        mod = sys.modules.get(module)
+        if mod is not None:
+            versions[module] = getattr(mod, '__version__', '?')
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+        'versions': versions,
+    }
+
+
+# ----------------------------------------------------------------------
+# Test texts
+# ----------------------------------------------------------------------
+
+TEXTE_FRANCAIS = """Bonjour! Ceci est un test OCR.
+Les chiffres: 123456789 et 0
+Caractères spéciaux: @#$%&*()
+Email: test@example.com
+Prix: 99.99€ ou $49.50"""
+
+TEXTE_ARABE = """مرحبا! هذا اختبار OCR.
+الأرقام: 123456789 و 0
+أحرف خاصة: @#$%&*()
+البريد: test@example.com
+السعر: 99.99€ أو $49.50"""
+
+TEXTE_ANGLAIS = """Hello! This is an OCR test.
+Numbers: 123456789 and 0
+Special chars: @#$%&*()
+Email: test@example.com
+Price: €99.99 or $49.50"""
+
+# Test texts plus extra lines: OCR corpus pages and TTS benchmark texts
+PHRASES = {
+    'fr': TEXTE_FRANCAIS.split('\n') + [
+        "La bibliothèque ouvre à 9h00 du lundi au vendredi.",
+        "Veuillez présenter votre carte d'étudiant à l'entrée.",
+        "Médicament: 2 comprimés par jour pendant 5 jours.",
+        "Date de péremption: 12/03/2027",
+        "Salle de lecture numéro 4, deuxième étage.",
+        "Ne pas dépasser la dose prescrite.",
+    ],
+    'en': TEXTE_ANGLAIS.split('\n') + [
+        "The reading room is open from 9 am to 6 pm.",
+        "Please return all books before the end of the month.",
+        "Take one tablet twice a day with water.",
+        "Best before: 2027-03-12",
+        "Emergency exit on the left side of the corridor.",
+        "Keep out of reach of children.",
+    ],
+    'ar': TEXTE_ARABE.split('\n') + [
+        "قاعة المطالعة مفتوحة من الساعة التاسعة صباحا.",
+        "يرجى إرجاع الكتب قبل نهاية الشهر.",
+        "تناول قرصا واحدا مرتين في اليوم.",
+        "تاريخ الانتهاء: 12/03/2027",
+        "مخرج الطوارئ على اليسار.",
+    ],
+}
@@ -0,0 +1,401 @@
+"""Kivy desktop app; started by App.py.
+
+Kept out of App.py because worker processes started with spawn re-import
+the main script, and importing this module opens a Kivy window.
+"""
+import time
+
+from kivy.app import App
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.button import Button
+from kivy.uix.label import Label
+from kivy.uix.image import Image as KivyImage
+from kivy.clock import Clock
+from kivy.core.window import Window
+from kivy.graphics.texture import Texture
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from threading import Thread, Lock
+import os
+from speech_worker import SpeechWorker, PRIORITY_HIGH, PRIORITY_NORMAL
+from long_text import LongTextSynthesizer
+from resource_governor import ResourceGovernor
+
+# easyocr (torch) and cv2 are imported lazily in the startup threads so the
+# window appears immediately instead of after several seconds of imports
+
+Window.clearcolor = (0.1, 0.1, 0.1, 1)
+
+# Optional OCR server (Serveur_Python/server.py), e.g. http://192.168.1.16:5000
+# When set, each capture goes to whichever of local/remote is currently faster
+OCR_SERVER_URL = os.environ.get('VISIONSPEAK_OCR_SERVER', '')
+# The server must run the same languages (VISIONSPEAK_OCR_LANGS, default en,fr)
+OCR_LANGS = ['en', 'fr']
+
+# Fixed prompts, pre-rendered at startup so they play without synthesis delay
+STATUS_PROMPTS = (
+    "Capturing",
+    "System prêt.",
+    "System not ready yet",
+    "Camera error",
+    "No text found. Try adjusting position or lighting.",
+    "No text detected. Make sure text is visible.",
+)
+
+class StartupTimer:
+    """Records start/end of each startup phase relative to process start"""
+    
+    def __init__(self, origin=None):
+        self.origin = origin if origin is not None else time.perf_counter()
+        self.phases = []
+        self._lock = Lock()
+    
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            with self._lock:
+                self.phases.append((name, start - self.origin, end - self.origin))
+    
+    def report(self):
+        """Phases sorted by start time; they overlap when run in parallel"""
+        total = time.perf_counter() - self.origin
+        lines = ["=== STARTUP TIMING ===", f"{'Phase':<22} {'Start (s)':>10} {'Duration (s)':>13}"]
+        for name, start, end in sorted(self.phases, key=lambda p: p[1]):
+            lines.append(f"{name:<22} {start:>10.2f} {end - start:>13.2f}")
+        lines.append(f"{'Total to ready':<22} {'':>10} {total:>13.2f}")
+        return '\n'.join(lines)
+
+
+class AccessibleOCRApp(App):
+    # Process start time, set by App.py so startup timing includes imports
+    start_time = None
+    
+    def build(self):
+        self.title = "VisionSpeak - Desktop Version (ENG+FR)"
+        
+        # Initialize components
+        self.reader = None
+        self.ocr = None
+        self.preprocessor = None
+        self.reader_ready = False
+        self.speech = None
+        self.last_detected_text = ""
+        
+        self.startup_timer = StartupTimer(self.start_time)
+        
+        # One core stays free for the UI and speech so OCR cannot starve them.
+        # Thread env vars must be set before torch is imported.
+        self.governor = ResourceGovernor.from_env(reserve=1)
+        self.governor.apply_env()
+        self.governor.pin()
+        
+        # OpenCV camera
+        self.capture = None
+        self.camera_active = False
+        self.camera_frame = None
+        
+        # Main layout - LARGE elements for accessibility
+        main_layout = BoxLayout(orientation='vertical', padding=20, spacing=15)
+        
+        # Camera preview - TOP SECTION
+        self.camera_widget = KivyImage(
+            size_hint=(1, 0.5),
+            allow_stretch=True,
+            keep_ratio=True
+        )
+        main_layout.add_widget(self.camera_widget)
+        
+        # Status display 
+        self.status_label = Label(
+            text='STARTING...',
+            size_hint=(1, 0.15),
+            font_size='40sp',
+            bold=True,
+            color=(1, 1, 1, 1),
+            halign='center',
+            valign='middle'
+        )
+        self.status_label.bind(size=self.status_label.setter('text_size'))
+        main_layout.add_widget(self.status_label)
+        
+        # Detected text 
+        self.text_label = Label(
+            text='Starting camera...',
+            size_hint=(1, 0.2),
+            font_size='28sp',
+            color=(0.9, 0.9, 0.9, 1),
+            halign='center',
+            valign='middle'
+        )
+        self.text_label.bind(size=self.text_label.setter('text_size'))
+        main_layout.add_widget(self.text_label)
+        
+        # LARGE buttons
+        button_layout = BoxLayout(size_hint=(1, 0.15), spacing=15)
+        
+        self.capture_btn = Button(
+            text='CAPTURE & READ',
+            background_color=(0.2, 0.8, 0.2, 1),
+            color=(1, 1, 1, 1),
+            font_size='32sp',
+            bold=True,
+            disabled=True
+        )
+        self.capture_btn.bind(on_press=self.capture_and_read)
+        button_layout.add_widget(self.capture_btn)
+        
+        self.stop_btn = Button(
+            text='STOP',
+            background_color=(0.9, 0.2, 0.2, 1),
+            color=(1, 1, 1, 1),
+            font_size='32sp',
+            bold=True
+        )
+        self.stop_btn.bind(on_press=self.stop_speaking)
+        button_layout.add_widget(self.stop_btn)
+        
+        main_layout.add_widget(button_layout)
+        
+        # Initialize in background
+        Thread(target=self.initialize_system, daemon=True).start()
+        
+        self.startup_timer.phases.append(('window', 0.0, time.perf_counter() - self.startup_timer.origin))
+        return main_layout
+    
+    def initialize_system(self):
+        """Initialize camera, OCR, and TTS in parallel"""
+        try:
+            Clock.schedule_once(lambda dt: setattr(self.status_label, 'text', 'LOADING...\n(First time may take 1-2 minutes)'))
+            
+            # The three subsystems are independent, so start them together.
+            # OCR takes longest; camera preview appears as soon as it is up.
+            pool = ThreadPoolExecutor(max_workers=3, thread_name_prefix='startup')
+            tts_future = pool.submit(self._init_tts)
+            camera_future = pool.submit(self._init_camera)
+            ocr_future = pool.submit(self._init_ocr)
+            pool.shutdown(wait=False)
+            
+            camera_future.result()
+            Clock.schedule_interval(self.update_camera_preview, 1.0 / 30.0)  # 30 FPS
+            Clock.schedule_once(lambda dt: setattr(self.text_label, 'text', 'Loading OCR...'))
+            
+            tts_future.result()
+            ocr_future.result()
+            self.reader_ready = True
+            
+            # Ready!
+            Clock.schedule_once(lambda dt: setattr(self.status_label, 'text', '✓ READY'))
+            Clock.schedule_once(lambda dt: setattr(self.text_label, 'text', 'Press CAPTURE & READ button'))
+            Clock.schedule_once(lambda dt: setattr(self.capture_btn, 'disabled', False))
+            
+            # Speak ready message
+            self.speak("System prêt.")
+            print(self.startup_timer.report())
+            print(self.governor.report())
+            
+        except Exception as e:
+            error_msg = f'ERROR: {str(e)}'
+            Clock.schedule_once(lambda dt: setattr(self.status_label, 'text', error_msg))
+            self.speak(f"Error starting system: {str(e)}")
+    
+    def _init_tts(self):
+        """Start the speech worker and wait for prompts to be pre-rendered"""
+        with self.startup_timer.phase('tts'):
+            # Long OCR results are read sentence by sentence, synthesized in parallel
+            long_text = LongTextSynthesizer(rate=150, workers=self.governor.plan['tts_workers'])
+            self.speech = SpeechWorker(rate=150, volume=1.0, prompts=STATUS_PROMPTS,
+                                       long_text=long_text).start()  # Slower rate for clarity
+            self.speech.ready.wait()
+            # Spawn the synthesis processes now (the speech worker has set their
+            # voice) so the first page read does not wait for pyttsx3 to start
+            long_text.warm_up()
+    
+    def _init_camera(self):
+        """Open the camera"""
+        with self.startup_timer.phase('import cv2'):
+            import cv2
+            self.governor.apply_opencv()
+        
+        with self.startup_timer.phase('camera'):
+            self.capture = cv2.VideoCapture(0)
+            if not self.capture.isOpened():
+                raise Exception("Cannot open camera")
+            
+            # Set camera resolution
+            self.capture.set(cv2.CAP_PROP_FRAME_WIDTH, 1280)
+            self.capture.set(cv2.CAP_PROP_FRAME_HEIGHT, 720)
+            self.camera_active = True
+    
+    def _init_ocr(self):
+        """Load EasyOCR and run a dummy inference so the first capture is fast"""
+        with self.startup_timer.phase('import easyocr'):
+            import easyocr  # noqa: F401 - timed here, used through create_reader
+            import cv2
+            import numpy as np
+            from ocr_int8 import create_reader
+            from ocr_offload import RemoteOCRClient, HybridOCRScheduler
+            from preprocessing import Preprocessor
+        
+        self.governor.apply_torch()
+        
+        with self.startup_timer.phase('load OCR model'):
+            # VISIONSPEAK_OCR_INT8=1 selects the quantized int8 models
+            self.reader = create_reader(OCR_LANGS, verbose=False)
+        
+        with self.startup_timer.phase('OCR warm-up'):
+            # Some text so both the detector and the recognizer run once
+            dummy = np.full((64, 320, 3), 255, dtype=np.uint8)
+            cv2.putText(dummy, 'Warm up 123', (10, 45), cv2.FONT_HERSHEY_SIMPLEX, 1.2, (0, 0, 0), 2)
+            self.reader.readtext(dummy, detail=1)
+        
+        remote = RemoteOCRClient(OCR_SERVER_URL, OCR_LANGS) if OCR_SERVER_URL else None
+        self.ocr = HybridOCRScheduler(self.reader, remote)
+        self.preprocessor = Preprocessor()
+    
+    def update_camera_preview(self, dt):
+        """Update camera preview in real-time"""
+        if not self.camera_active or not self.capture:
+            return
+        
+        import cv2
+        ret, frame = self.capture.read()
+        if ret:
+            # Store frame for capture
+            self.camera_frame = frame.copy()
+            
+            # Convert BGR to RGB
+            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            
+            # Flip horizontally for mirror effect (more intuitive)
+            frame_rgb = cv2.flip(frame_rgb, 1)
+            
+            # Convert to Kivy texture
+            h, w = frame_rgb.shape[:2]
+            texture = Texture.create(size=(w, h))
+            texture.blit_buffer(frame_rgb.tobytes(), colorfmt='rgb', bufferfmt='ubyte')
+            texture.flip_vertical()
+            
+            self.camera_widget.texture = texture
+    
+    def capture_and_read(self, instance):
+        """Capture image from camera and read text"""
+        if not self.camera_active or not self.reader_ready:
+            self.speak("System not ready yet")
+            return
+        
+        self.capture_btn.disabled = True
+        Clock.schedule_once(lambda dt: setattr(self.status_label, 'text', 'CAPTURING...'))
+        self.speak("Capturing", interrupt=True)
+        
+        Thread(target=self._capture_and_process, daemon=True).start()
+    
+    def _capture_and_process(self):
+        """Capture and process in background"""
+        try:
+            # Use the stored camera frame
+            if self.camera_frame is None:
+                Clock.schedule_once(lambda dt: self._update_ui('CAMERA ERROR', 'No frame available', True))
+                self.speak("Camera error")
+                return
+            
+            import cv2
+            from preprocessing import map_to_original
+            frame = self.camera_frame.copy()
+            Clock.schedule_once(lambda dt: setattr(self.status_label, 'text', 'READING TEXT...'))
+            
+            # Convert to RGB
+            img_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            
+            # Quality metrics decide which enhancement stages (if any) this frame needs
+            prep = self.preprocessor.process(frame)
+            print(f"Preprocessing: {prep['stages'] or 'none'} "
+                  f"({sum(prep['timings'].values()) * 1000:.0f} ms)")
+            
+            # Run OCR on the original, and on the enhanced frame only when needed.
+            # Resize/deskew move pixels, so those boxes are mapped back to the
+            # frame before both passes are sorted together by position.
+            all_results = self.ocr.readtext(img_rgb)
+            if prep['image'] is not None:
+                enhanced = self.ocr.readtext(prep['image'])
+                all_results = all_results + map_to_original(enhanced, prep['transform'])
+            
+            if all_results:
+                # Filter by confidence and remove duplicates
+                seen = set()
+                text_blocks = []
+                
+                for (bbox, text, conf) in all_results:
+                    text_lower = text.lower().strip()
+                    if conf > 0.3 and text_lower and text_lower not in seen:
+                        seen.add(text_lower)
+                        text_blocks.append((bbox[0][1], text, conf))  # (y_pos, text, conf)
+                
+                if text_blocks:
+                    # Sort by vertical position
+                    text_blocks.sort(key=lambda x: x[0])
+                    detected_text = ' '.join([text for (_, text, _) in text_blocks])
+                    avg_conf = sum(conf for (_, _, conf) in text_blocks) / len(text_blocks)
+                    
+                    Clock.schedule_once(lambda dt: self._update_ui(
+                        f'FOUND TEXT\nConfidence: {avg_conf:.0%}',
+                        detected_text,
+                        True
+                    ))
+                    
+                    self.last_detected_text = detected_text
+                    self.speak(detected_text, priority=PRIORITY_NORMAL)
+                else:
+                    Clock.schedule_once(lambda dt: self._update_ui(
+                        'NO TEXT FOUND',
+                        'Try: Better lighting, closer/farther, steadier hold',
+                        True
+                    ))
+                    self.speak("No text found. Try adjusting position or lighting.")
+            else:
+                Clock.schedule_once(lambda dt: self._update_ui(
+                    'NO TEXT DETECTED',
+                    'Ensure text is visible and well-lit',
+                    True
+                ))
+                self.speak("No text detected. Make sure text is visible.")
+                
+        except Exception as e:
+            error_msg = f'Error: {str(e)}'
+            Clock.schedule_once(lambda dt: self._update_ui('ERROR', error_msg, True))
+            self.speak(f"Error: {str(e)}")
+    
+    def _update_ui(self, status, text, enable_button):
+        """Update UI on main thread"""
+        self.status_label.text = status
+        self.text_label.text = text
+        if enable_button:
+            self.capture_btn.disabled = False
+    
+    def speak(self, text, priority=PRIORITY_HIGH, interrupt=False):
+        """Queue text for the speech worker (never blocks the caller)"""
+        if self.speech and text:
+            self.speech.say(text, priority=priority, interrupt=interrupt)
+    
+    def stop_speaking(self, instance):
+        """Stop TTS"""
+        if self.speech:
+            self.speech.cancel()
+            self.status_label.text = 'STOPPED'
+    
+    def on_stop(self):
+        """Cleanup on exit"""
+        if self.capture:
+            self.capture.release()
+        if self.speech:
+            self.speech.shutdown()
+        if self.ocr and self.ocr.remote:
+            self.ocr.remote.close()
+
+def main(start_time=None):
+    app = AccessibleOCRApp()
+    app.start_time = start_time
+    app.run()
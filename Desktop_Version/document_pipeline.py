@@ -0,0 +1,206 @@
+"""Streaming OCR of multi-page PDFs and image sets with bounded memory.
+
+    python document_pipeline.py livret.pdf --engine easyocr-fr-en --output livret.txt
+    python document_pipeline.py scans/ --engine tesseract-inproc
+
+Pages are rasterized one at a time on a producer thread and handed to the
+OCR engine through a queue of at most --prefetch pages, so peak memory
+depends on the page size and prefetch depth, not on the page count.
+"""
+import argparse
+import queue
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+from PIL import Image, ImageSequence
+
+IMAGE_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.bmp', '.tif', '.tiff', '.webp'}
+MAX_PAGE_SIDE = 4000  # pixels; guards against huge page sizes at high DPI
+
+_DONE = object()
+
+
+def _to_rgb_array(img):
+    if img.mode != 'RGB':
+        img = img.convert('RGB')
+    return np.asarray(img)
+
+
+def pdf_pages(path, dpi=200):
+    """Yield (page number, RGB array) for each PDF page, rendered on demand"""
+    try:
+        import pypdfium2 as pdfium
+    except ImportError:
+        pdfium = None
+
+    if pdfium is not None:
+        pdf = pdfium.PdfDocument(str(path))
+        try:
+            for index in range(len(pdf)):
+                page = pdf[index]
+                width, height = page.get_size()  # points (1/72 inch)
+                scale = min(dpi / 72.0, MAX_PAGE_SIDE / max(width, height))
+                bitmap = page.render(scale=scale)
+                pixels = _to_rgb_array(bitmap.to_pil())
+                bitmap.close()
+                page.close()
+                yield index + 1, pixels
+        finally:
+            pdf.close()
+        return
+
+    try:
+        import fitz  # PyMuPDF
+    except ImportError:
+        raise ImportError("Lecture PDF : pip install pypdfium2 (ou pymupdf)")
+
+    doc = fitz.open(str(path))
+    try:
+        for index in range(doc.page_count):
+            page = doc.load_page(index)
+            rect = page.rect
+            scale = min(dpi / 72.0, MAX_PAGE_SIDE / max(rect.width, rect.height))
+            pix = page.get_pixmap(matrix=fitz.Matrix(scale, scale), alpha=False)
+            # Copy: the pixmap buffer is released with pix
+            pixels = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.width, pix.n).copy()
+            del pix
+            yield index + 1, pixels[:, :, :3]
+    finally:
+        doc.close()
+
+
+def image_pages(paths):
+    """Yield (page number, RGB array) for image files; multi-frame TIFFs count as several pages"""
+    number = 0
+    for path in paths:
+        with Image.open(path) as img:
+            for frame in ImageSequence.Iterator(img):
+                number += 1
+                yield number, _to_rgb_array(frame)
+
+
+def open_pages(source, dpi=200):
+    """Page generator for a PDF, an image file or a directory of images"""
+    source = Path(source)
+    if source.is_dir():
+        files = sorted(p for p in source.iterdir() if p.suffix.lower() in IMAGE_EXTENSIONS)
+        if not files:
+            raise ValueError(f"No images in {source}")
+        return image_pages(files)
+    if source.suffix.lower() == '.pdf':
+        return pdf_pages(source, dpi)
+    if source.suffix.lower() in IMAGE_EXTENSIONS:
+        return image_pages([source])
+    raise ValueError(f"Unsupported document type: {source}")
+
+
+def prefetch(pages, depth=2):
+    """Run the pages generator on a thread, at most `depth` pages ahead of the consumer"""
+    buffer = queue.Queue(maxsize=max(1, depth))
+    stop = threading.Event()
+
+    def put(item):
+        # Time out regularly so a consumer that stopped early releases us
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for page in pages:
+                if not put(page):
+                    return
+            put(_DONE)
+        except BaseException as e:
+            put(e)
+        finally:
+            close = getattr(pages, 'close', None)
+            if close:
+                close()
+
+    producer = threading.Thread(target=produce, name='page-prefetch', daemon=True)
+    producer.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is _DONE:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        producer.join()
+
+
+def process_document(source, engine, prefetch_depth=2, dpi=200):
+    """OCR a document page by page, yielding each page's result as soon as it is done.
+
+    engine is any object with recognize(rgb_array) -> text (see ocr_engines).
+    Yields {'page', 'text', 'width', 'height', 'seconds'}.
+    """
+    pages = prefetch(open_pages(source, dpi), prefetch_depth)
+    try:
+        for number, pixels in pages:
+            start = time.perf_counter()
+            text = engine.recognize(pixels)
+            yield {
+                'page': number,
+                'text': text,
+                'width': int(pixels.shape[1]),
+                'height': int(pixels.shape[0]),
+                'seconds': time.perf_counter() - start,
+            }
+            # Drop our reference before the next page is pulled
+            del pixels
+    finally:
+        # Stops the producer thread when the caller stops early
+        pages.close()
+
+
+def main(argv=None):
+    from ocr_engines import ENGINES, create_engine
+    from ocr_memory import current_rss_mb
+
+    parser = argparse.ArgumentParser(description="Streaming OCR of PDFs and image sets")
+    parser.add_argument('source', help="PDF, image, multi-page TIFF or directory of images")
+    parser.add_argument('--engine', default='easyocr-fr-en', choices=list(ENGINES))
+    parser.add_argument('--prefetch', type=int, default=2, help="pages rendered ahead of OCR")
+    parser.add_argument('--dpi', type=int, default=200)
+    parser.add_argument('--output', help="text file to write (pages are appended as they finish)")
+    args = parser.parse_args(argv)
+
+    engine = create_engine(args.engine)
+    engine.load()
+
+    out = open(args.output, 'w', encoding='utf-8') if args.output else None
+    start = time.perf_counter()
+    pages = 0
+    try:
+        for result in process_document(args.source, engine, args.prefetch, args.dpi):
+            pages += 1
+            print(f"📄 Page {result['page']}: {result['seconds']:.2f}s, "
+                  f"{len(result['text'])} caractères, RSS {current_rss_mb():.0f} MB", flush=True)
+            if out:
+                out.write(f"=== Page {result['page']} ===\n{result['text']}\n\n")
+                out.flush()
+            else:
+                print(result['text'])
+    finally:
+        if out:
+            out.close()
+        engine.close()
+
+    print(f"✅ {pages} pages en {time.perf_counter() - start:.1f}s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
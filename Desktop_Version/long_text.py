@@ -0,0 +1,220 @@
+"""Sentence-segmented parallel synthesis for long texts.
+
+A page of OCR output sent to pyttsx3 in one call is only audible once the
+whole page is synthesized. Here the text is split into sentences, the
+sentences are synthesized in parallel by a pool of processes (pyttsx3
+engines are neither thread-safe nor shareable), and segments are handed
+out in reading order as soon as each is ready, so speech starts after
+about one sentence of synthesis.
+
+    synth = LongTextSynthesizer(rate=150)
+    for index, sentence, wav_path in synth.synthesize(page_text):
+        play(wav_path)
+    synth.save(page_text, 'page.wav')
+    synth.close()
+
+Segments go through the shared TTSCache, so re-reading a page costs nothing.
+Workers are spawned, so the main script of the calling program must be
+safe to import (App.py keeps the Kivy app in desktop_app.py for this).
+"""
+import multiprocessing
+import os
+import re
+import tempfile
+import wave
+from concurrent.futures import ProcessPoolExecutor
+
+from tts_cache import TTSCache, cache_key
+
+MAX_SEGMENT_CHARS = 250
+
+# Sentence ends: Latin . ! ? … and Arabic question mark ؟ / full stop ۔, with
+# the closing quotes and brackets that follow (captured, they stay on the sentence)
+CLOSERS = '"»”\')]'
+# (French puts a space before »)
+SENTENCE_END = re.compile(r'([.!?…؟۔](?:\s?["»”\')\]])*)\s+')
+# Clause boundaries, used to split sentences that are still too long:
+# , ; : and the Arabic comma ، and semicolon ؛
+CLAUSE_END = re.compile(r'(?<=[,;:،؛])\s+')
+# A period after these is not the end of a sentence
+ABBREVIATIONS = {
+    'm', 'mm', 'mme', 'mlle', 'dr', 'pr', 'st', 'ste', 'p', 'ex', 'etc', 'cf', 'vol', 'no', 'n°',
+    'mr', 'mrs', 'ms', 'prof', 'jr', 'sr', 'vs', 'e.g', 'i.e', 'fig', 'approx',
+}
+
+
+def _ends_with_abbreviation(segment):
+    words = segment.rstrip(CLOSERS).rstrip('.').split()
+    if not words:
+        return False
+    last = words[-1].lstrip('"«“\'([').lower()
+    # Initials such as "J. Dupont"
+    return last in ABBREVIATIONS or (len(last) == 1 and last.isalpha())
+
+
+def _wrap(text, max_chars, pattern):
+    """Split text at pattern boundaries, packing pieces up to max_chars"""
+    pieces = pattern.split(text) if pattern else text.split(' ')
+    out, current = [], ''
+    for piece in pieces:
+        candidate = f'{current} {piece}' if current else piece
+        if current and len(candidate) > max_chars:
+            out.append(current)
+            current = piece
+        else:
+            current = candidate
+    if current:
+        out.append(current)
+    return out
+
+
+def split_sentences(text, max_chars=MAX_SEGMENT_CHARS):
+    """Split text into speakable segments in reading order.
+
+    Blank lines and sentence punctuation (including Arabic ؟) end a
+    segment; single line breaks, as produced by OCR line wrapping, do not.
+    Sentences longer than max_chars are split at clause punctuation
+    (including Arabic ، and ؛), then between words.
+    """
+    segments = []
+    for paragraph in re.split(r'\n\s*\n', text):
+        paragraph = ' '.join(paragraph.split())
+        if not paragraph:
+            continue
+        sentences = []
+        pieces = SENTENCE_END.split(paragraph)
+        for part, end in zip(pieces[0::2], pieces[1::2] + ['']):
+            part += end
+            if sentences and _ends_with_abbreviation(sentences[-1]):
+                sentences[-1] = f'{sentences[-1]} {part}'
+            else:
+                sentences.append(part)
+        for sentence in sentences:
+            if len(sentence) <= max_chars:
+                segments.append(sentence)
+                continue
+            for clause in _wrap(sentence, max_chars, CLAUSE_END):
+                segments.extend(_wrap(clause, max_chars, None) if len(clause) > max_chars else [clause])
+    return [s for s in segments if s.strip()]
+
+
+# ==========================================
+# WORKER PROCESSES
+# ==========================================
+
+_engine = None
+_cache = None
+
+
+def _init_worker(rate, voice, cache_dir, max_bytes):
+    global _engine, _cache
+    import pyttsx3
+    _engine = pyttsx3.init()
+    _engine.setProperty('rate', rate)
+    _engine.setProperty('volume', 1.0)  # volume is applied at playback
+    if voice:
+        _engine.setProperty('voice', voice)
+    _cache = TTSCache(cache_dir, max_bytes)
+
+
+def _synthesize_segment(text, rate, voice):
+    """Render one segment into the shared cache and return its path"""
+    def render(path):
+        _engine.save_to_file(text, path)
+        _engine.runAndWait()
+    return str(_cache.get_or_create(cache_key('pyttsx3', voice, rate, None, text), '.wav', render))
+
+
+def _warm_up_worker():
+    """Render a throwaway segment so the driver is started before real text arrives"""
+    fd, path = tempfile.mkstemp(suffix='.wav')
+    os.close(fd)
+    try:
+        _engine.save_to_file('Ready.', path)
+        _engine.runAndWait()
+    finally:
+        os.remove(path)
+
+
+def _default_voice():
+    import pyttsx3
+    return pyttsx3.init().getProperty('voice')
+
+
+class LongTextSynthesizer:
+    """Pool of pyttsx3 processes synthesizing the sentences of a text in parallel"""
+
+    def __init__(self, rate=150, voice=None, workers=None, cache=None, max_chars=MAX_SEGMENT_CHARS):
+        self.rate = rate
+        self.voice = voice
+        self.max_chars = max_chars
+        self.cache = cache if cache is not None else TTSCache()
+        # One core stays for playback and the UI
+        self.workers = workers or max(1, min(4, (os.cpu_count() or 2) - 1))
+        self._pool = None
+        self._pending = []
+
+    def _start(self):
+        if self._pool is None:
+            if self.voice is None:
+                # Cache keys use the voice id, like the speech worker's
+                self.voice = _default_voice()
+            # Always spawn: the pool is started from the speech thread of a
+            # process holding SDL/GL state and other threads, which fork would copy
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+                initargs=(self.rate, self.voice, str(self.cache.directory), self.cache.max_bytes)
+            )
+        return self._pool
+
+    def warm_up(self):
+        """Start every worker process without waiting for them"""
+        pool = self._start()
+        # Spawn pools start a process per submit while none is idle
+        return [pool.submit(_warm_up_worker) for _ in range(self.workers)]
+
+    def synthesize(self, text):
+        """Yield (index, sentence, wav path) in reading order as segments become ready"""
+        segments = split_sentences(text, self.max_chars)
+        pool = self._start()
+        futures = []
+        for segment in segments:
+            path = self.cache.get(cache_key('pyttsx3', self.voice, self.rate, None, segment))
+            futures.append(str(path) if path else pool.submit(_synthesize_segment, segment, self.rate, self.voice))
+        self._pending = [f for f in futures if not isinstance(f, str)]
+        try:
+            for index, (segment, future) in enumerate(zip(segments, futures)):
+                yield index, segment, future if isinstance(future, str) else future.result()
+        finally:
+            # Stopped early (e.g. speech interrupted): drop what has not started
+            self.cancel()
+
+    def cancel(self):
+        for future in self._pending:
+            future.cancel()
+        self._pending = []
+
+    def save(self, text, path):
+        """Synthesize text and concatenate the segments into one WAV file"""
+        out = None
+        try:
+            for _, _, segment_path in self.synthesize(text):
+                with wave.open(segment_path, 'rb') as segment:
+                    if out is None:
+                        out = wave.open(str(path), 'wb')
+                        out.setparams(segment.getparams())
+                    elif segment.getparams()[:3] != out.getparams()[:3]:
+                        raise ValueError(f"Segment format differs: {segment.getparams()}")
+                    out.writeframes(segment.readframes(segment.getnframes()))
+        finally:
+            if out is not None:
+                out.close()
+        return path
+
+    def close(self):
+        self.cancel()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
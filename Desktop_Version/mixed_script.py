@@ -0,0 +1,163 @@
+import cv2
+import numpy as np
+
+from ocr_engines import reading_order
+
+# Score above which a crop is treated as Arabic. Crops scoring inside
+# AMBIGUOUS are recognized by both models and the more confident result wins.
+# Starting values; check them on a corpus before changing the scoring:
+#   python ocr_bench.py run --engines easyocr-mixed --output mixed.json
+#   python ocr_bench.py routing mixed.json
+ARABIC_THRESHOLD = 0.25
+AMBIGUOUS = (0.18, 0.32)
+
+
+def script_score(crop):
+    """Cheap Arabic-vs-Latin score for a grayscale text crop (higher = Arabic).
+
+    Two pixel features separate the scripts well on printed text:
+      * the share of small connected components (Arabic dots and
+        diacritics sit above/below the main body of the line),
+      * how dominant the densest row is (Arabic letters join along a
+        single baseline, Latin ink is spread over the x-height band).
+    """
+    if crop.size == 0 or min(crop.shape[:2]) < 4:
+        return 0.0
+    _, binary = cv2.threshold(crop, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+    rows = binary.mean(axis=1) / 255.0
+    ink_rows = np.nonzero(rows > 0.01)[0]
+    if len(ink_rows) == 0:
+        return 0.0
+    height = ink_rows[-1] - ink_rows[0] + 1
+    peak = rows.max() / (rows[ink_rows].mean() + 1e-6)
+
+    n, _, stats, _ = cv2.connectedComponentsWithStats(binary, connectivity=8)
+    if n <= 1:
+        return 0.0
+    widths, heights = stats[1:, cv2.CC_STAT_WIDTH], stats[1:, cv2.CC_STAT_HEIGHT]
+    small = np.mean((heights < 0.2 * height) & (widths < 0.2 * height))
+    return float(small + 0.1 * (peak - 2.0))
+
+
+def _crop(gray, box, free):
+    h, w = gray.shape[:2]
+    if free:
+        xs = [p[0] for p in box]
+        ys = [p[1] for p in box]
+        x_min, x_max, y_min, y_max = min(xs), max(xs), min(ys), max(ys)
+    else:
+        x_min, x_max, y_min, y_max = box
+    x_min, y_min = max(0, int(x_min)), max(0, int(y_min))
+    x_max, y_max = min(w, int(x_max)), min(h, int(y_max))
+    return gray[y_min:y_max, x_min:x_max]
+
+
+class MixedScriptReader:
+    """One detection pass, each line recognized only by the model for its script.
+
+    The Latin reader owns the (shared) CRAFT detector; the Arabic reader is
+    created with detector=False so its detector weights are never loaded.
+    int8 selects the quantized models of ocr_int8 (None: VISIONSPEAK_OCR_INT8).
+    last_routing describes the last readtext call, including the score and
+    route of every box, so routing can be checked against labelled pages.
+    """
+
+    def __init__(self, latin_languages=('fr', 'en'), arabic_languages=('ar', 'en'), gpu=False, int8=None,
+                 arabic_threshold=ARABIC_THRESHOLD, ambiguous=AMBIGUOUS):
+        from ocr_int8 import create_reader
+        self.latin = create_reader(latin_languages, int8=int8, gpu=gpu, verbose=False)
+        self.arabic = create_reader(arabic_languages, int8=int8, gpu=gpu, verbose=False, detector=False)
+        self.arabic_threshold = arabic_threshold
+        self.ambiguous = tuple(ambiguous)
+        self.last_routing = {}
+
+    def readtext(self, image, detail=1):
+        """Same output as easyocr's readtext, in reading order"""
+        from easyocr.utils import reformat_input
+        img, gray = reformat_input(image)
+
+        horizontal_list, free_list = self.latin.detect(img)
+        boxes = [(box, False) for box in horizontal_list[0]] + [(box, True) for box in free_list[0]]
+
+        routes = {'latin': ([], []), 'arabic': ([], [])}
+        ambiguous = []
+        scores, decisions = [], []
+        for box, free in boxes:
+            score = script_score(_crop(gray, box, free))
+            if self.ambiguous[0] < score < self.ambiguous[1]:
+                ambiguous.append((box, free))
+                script = 'ambiguous'
+            else:
+                script = 'arabic' if score >= self.arabic_threshold else 'latin'
+                routes[script][1 if free else 0].append(box)
+            scores.append(round(score, 4))
+            decisions.append(script)
+
+        results = []
+        for script, reader in (('latin', self.latin), ('arabic', self.arabic)):
+            horizontal, free = routes[script]
+            if horizontal or free:
+                results += reader.recognize(gray, horizontal_list=horizontal, free_list=free, detail=1)
+
+        for box, free in ambiguous:
+            horizontal, free_boxes = ([], [box]) if free else ([box], [])
+            candidates = []
+            for reader in (self.latin, self.arabic):
+                candidates += reader.recognize(gray, horizontal_list=horizontal, free_list=free_boxes, detail=1)
+            if candidates:
+                results.append(max(candidates, key=lambda r: r[2]))
+
+        self.last_routing = {
+            'boxes': len(boxes),
+            'latin': sum(map(len, routes['latin'])),
+            'arabic': sum(map(len, routes['arabic'])),
+            'ambiguous': len(ambiguous),
+            'scores': scores,
+            'routes': decisions,
+        }
+
+        results = reading_order(results)
+        if detail == 0:
+            return [text for (_, text, _) in results]
+        return results
+
+
+# ----------------------------------------------------------------------
+# Calibration
+# ----------------------------------------------------------------------
+
+def routing_accuracy(scored, threshold=ARABIC_THRESHOLD, ambiguous=AMBIGUOUS):
+    """Share of labelled (score, is_arabic) boxes routed to the right model.
+
+    Ambiguous boxes go to both models, so they count as correct but are
+    also reported separately: they cost a second recognition.
+    """
+    if not scored:
+        return {'boxes': 0}
+    wrong = band = 0
+    for score, is_arabic in scored:
+        if ambiguous[0] < score < ambiguous[1]:
+            band += 1
+        elif (score >= threshold) != is_arabic:
+            wrong += 1
+    return {'boxes': len(scored), 'accuracy': 1 - wrong / len(scored), 'ambiguous': band / len(scored)}
+
+
+def calibrate(scored, target=0.99):
+    """Threshold and ambiguous band from labelled (score, is_arabic) boxes.
+
+    The threshold is the split with the fewest misrouted boxes; the band is
+    the narrowest one around it that brings accuracy up to target.
+    """
+    candidates = sorted({score for score, _ in scored})
+    if len(candidates) < 2:
+        return None
+    splits = [(a + b) / 2 for a, b in zip(candidates, candidates[1:])]
+    threshold = max(splits, key=lambda t: routing_accuracy(scored, t, (t, t))['accuracy'])
+    widths = sorted({abs(score - threshold) for score, _ in scored})
+    for width in [0.0] + [w + 1e-6 for w in widths]:
+        band = (threshold - width, threshold + width)
+        result = routing_accuracy(scored, threshold, band)
+        if result['accuracy'] >= target:
+            break
+    return {'threshold': threshold, 'band': band, **result}
@@ -0,0 +1,492 @@
+"""OCR accuracy/throughput benchmark on a synthetic multilingual corpus.
+
+    python ocr_bench.py generate --out corpus --count 60
+    python ocr_bench.py run --corpus corpus --engines tesseract easyocr-fr-en --output results.json
+    python ocr_bench.py run --isolation concurrent --cpu-budget 8 ...
+    python ocr_bench.py compare results.json --baseline baseline.json
+    python ocr_bench.py routing results.json
+
+Latency samples are per-image medians over --repeats timed runs, taken
+after --warmup untimed images. Baseline comparisons pair each image with
+its baseline measurement and bootstrap over images (per-image latency
+ratio, pooled CER change), so neither run-to-run noise nor the spread
+between easy and hard images is reported as a change. Results on
+different corpora are refused (exit code 2).
+
+By default every engine runs in its own fresh process (--isolation
+sequential), so load times, memory and thread pools left behind by one
+engine cannot skew the next. --isolation concurrent runs all engines at
+once on disjoint core sets; --isolation none runs them in this process.
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+import unicodedata
+from datetime import datetime
+
+# cv2, numpy, PIL and the engines are imported inside the functions that
+# need them: isolated engine processes (spawn) re-import this script as
+# __mp_main__, and must size the BLAS/OpenMP/OpenCV pools before those load.
+from bench_common import environment, median_ratio, paired_bootstrap_ci, pooled_delta, summarize
+from ocr_memory import MemoryProbe, current_rss_mb, peak_rss_mb, profile_engine_memory, settle_rss
+
+
+# ----------------------------------------------------------------------
+# Accuracy
+# ----------------------------------------------------------------------
+
+def normalize_text(text):
+    """NFC, case kept, all whitespace runs collapsed to one space"""
+    return ' '.join(unicodedata.normalize('NFC', text).split())
+
+
+def levenshtein(a, b):
+    """Edit distance between two sequences (characters or words)"""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, item_a in enumerate(a, 1):
+        current = [i]
+        for j, item_b in enumerate(b, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (item_a != item_b)
+            ))
+        previous = current
+    return previous[-1]
+
+
+def error_counts(reference, hypothesis):
+    """(char edits, reference chars, word edits, reference words)"""
+    ref, hyp = normalize_text(reference), normalize_text(hypothesis)
+    ref_words, hyp_words = ref.split(), hyp.split()
+    return levenshtein(ref, hyp), len(ref), levenshtein(ref_words, hyp_words), len(ref_words)
+
+
+def routing_summary(per_sample):
+    """Mixed-script routing against the corpus labels, per language and overall.
+
+    Every box of an 'ar' sample should go to the Arabic model, every other
+    box to the Latin one. Arabic samples also contain digits and e-mail
+    addresses, so their accuracy is a lower bound. Ambiguous boxes are
+    recognized by both models: not wrong, but twice as expensive.
+    """
+    totals = {}
+    scored = []
+    for sample in per_sample:
+        routing = sample.get('routing')
+        if not routing:
+            continue
+        expected = 'arabic' if sample['lang'] == 'ar' else 'latin'
+        for score, route in zip(routing['scores'], routing['routes']):
+            scored.append((score, expected == 'arabic'))
+            for key in ('all', sample['lang']):
+                acc = totals.setdefault(key, [0, 0, 0])
+                acc[0] += 1
+                acc[1] += route == expected
+                acc[2] += route == 'ambiguous'
+    if not scored:
+        return None
+    summary = {
+        key: {'boxes': n, 'accuracy': (right + band) / n, 'misrouted': n - right - band, 'ambiguous': band / n}
+        for key, (n, right, band) in totals.items()
+    }
+    # Threshold and band that would have routed these boxes best
+    from mixed_script import calibrate
+    summary['calibrated'] = calibrate(scored)
+    return summary
+
+
+# ----------------------------------------------------------------------
+# Measurement
+# ----------------------------------------------------------------------
+
+def sized_pages(image, sizes):
+    """image rescaled so its longest side is each of sizes: {'1280px': array}"""
+    import cv2
+    h, w = image.shape[:2]
+    pages = {}
+    for size in sizes:
+        scale = size / float(max(h, w))
+        interpolation = cv2.INTER_AREA if scale < 1 else cv2.INTER_CUBIC
+        pages[f'{size}px'] = cv2.resize(image, (round(w * scale), round(h * scale)), interpolation=interpolation)
+    return pages
+
+
+def benchmark_engine(name, corpus, warmup=2, repeats=3, memory_sizes=(640, 1280, 1920), after_load=None):
+    """Cold load, warm latency, throughput, CER/WER and memory of one engine on the corpus.
+
+    after_load() runs once the engine is loaded, before any inference
+    (isolated workers use it to size the torch thread pools).
+    """
+    import numpy as np
+    from PIL import Image
+    from ocr_engines import create_engine
+
+    samples = corpus['samples']
+    # Decode everything up front so file I/O is not part of the timings
+    images = [np.asarray(Image.open(s['path']).convert('RGB')) for s in samples]
+
+    rss_before_load = settle_rss()
+    # No tracemalloc here: it would slow the timed load down
+    with MemoryProbe(interval=0.02, trace=False) as load_probe:
+        start = time.perf_counter()
+        engine = create_engine(name)
+        engine.load()
+        load_time = time.perf_counter() - start
+    steady_after_load = settle_rss()
+    if after_load is not None:
+        after_load()
+
+    for image in images[:warmup]:
+        engine.recognize(image)
+
+    per_image = [[] for _ in images]
+    pass_times = []
+    hypotheses = [''] * len(images)
+    details = [None] * len(images)
+    for _ in range(repeats):
+        pass_start = time.perf_counter()
+        for i, image in enumerate(images):
+            t0 = time.perf_counter()
+            hypotheses[i] = engine.recognize(image)
+            per_image[i].append(time.perf_counter() - t0)
+            details[i] = engine.details()
+        pass_times.append(time.perf_counter() - pass_start)
+
+    # Memory per inference is measured separately, after the timed runs
+    memory = {
+        'rss_before_load_mb': rss_before_load,
+        'load_peak_rss_mb': load_probe.result['rss_peak'],
+        'steady_after_load_mb': steady_after_load,
+        'model_rss_mb': steady_after_load - rss_before_load,
+    }
+    if memory_sizes and images:
+        memory.update(profile_engine_memory(engine, sized_pages(images[0], memory_sizes)))
+    engine.close()
+
+    latencies = [statistics.median(times) for times in per_image]
+
+    totals = {}
+    per_sample = []
+    for sample, hypothesis, latency, detail in zip(samples, hypotheses, latencies, details):
+        counts = error_counts(sample['ground_truth'], hypothesis)
+        for key in ('all', sample['lang']):
+            acc = totals.setdefault(key, [0, 0, 0, 0])
+            for k in range(4):
+                acc[k] += counts[k]
+        per_sample.append({
+            'file': sample['file'],
+            'lang': sample['lang'],
+            'latency': latency,
+            'char_edits': counts[0],
+            'ref_chars': counts[1],
+            'cer': counts[0] / max(counts[1], 1),
+            'wer': counts[2] / max(counts[3], 1),
+            'text': hypothesis,
+            **(detail or {}),
+        })
+
+    accuracy = {
+        key: {'cer': c[0] / max(c[1], 1), 'wer': c[2] / max(c[3], 1)}
+        for key, c in totals.items()
+    }
+
+    result = {
+        'engine': name,
+        'load_time': load_time,
+        'latency': summarize(latencies),
+        'latency_samples': latencies,
+        'pass_times': pass_times,
+        'images_per_second': len(images) / statistics.median(pass_times),
+        'accuracy': accuracy,
+        # Cumulative high-water mark: only per-engine when one engine runs per process
+        'peak_rss_mb': peak_rss_mb(),
+        'rss_mb': current_rss_mb(),
+        'memory': memory,
+        'samples': per_sample,
+    }
+    routing = routing_summary(per_sample)
+    if routing:
+        result['routing'] = routing
+    return result
+
+
+def run_suite(corpus_dir, engines, warmup=2, repeats=3, isolation='sequential', cpu_budget=None, timeout=None,
+              memory_sizes=(640, 1280, 1920)):
+    from ocr_corpus import load_corpus
+    corpus = load_corpus(corpus_dir)
+    results = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'corpus': corpus_dir,
+            'corpus_hash': corpus['hash'],
+            'warmup': warmup,
+            'repeats': repeats,
+            'isolation': isolation,
+            'cpu_budget': cpu_budget,
+            'memory_sizes': list(memory_sizes),
+            'environment': environment(),
+        },
+        'engines': {},
+    }
+    start = time.perf_counter()
+    if isolation == 'none':
+        for name in engines:
+            print(f"▶ {name}...", flush=True)
+            try:
+                results['engines'][name] = benchmark_engine(name, corpus, warmup, repeats, memory_sizes)
+            except Exception as e:
+                print(f"❌ {name}: {e}")
+                results['engines'][name] = {'engine': name, 'error': str(e)}
+        # environment() is filled after the engines are imported
+        results['meta']['environment'] = environment()
+    else:
+        from ocr_runner import run_isolated
+        results['engines'] = run_isolated(corpus_dir, engines, warmup, repeats, isolation, cpu_budget, timeout,
+                                          memory_sizes)
+    results['meta']['wall_time'] = time.perf_counter() - start
+    return results
+
+
+# ----------------------------------------------------------------------
+# Reporting
+# ----------------------------------------------------------------------
+
+def print_results(results):
+    print(f"\n{'Engine':<18} {'Load (s)':>9} {'Median (s)':>11} {'95% CI':>17} {'Img/s':>7} "
+          f"{'CER':>6} {'WER':>6} {'Peak RSS':>9}")
+    print("-" * 92)
+    for name, r in results['engines'].items():
+        if 'error' in r:
+            print(f"{name:<18} ERROR: {r['error'].strip().splitlines()[-1]}")
+            continue
+        lat = r['latency']
+        lo, hi = lat['median_ci95']
+        ci = f"[{lo:.3f}, {hi:.3f}]" if lo is not None else "-"
+        acc = r['accuracy']['all']
+        print(f"{name:<18} {r['load_time']:>9.2f} {lat['median']:>11.3f} {ci:>17} "
+              f"{r['images_per_second']:>7.2f} {acc['cer']:>6.1%} {acc['wer']:>6.1%} "
+              f"{r['peak_rss_mb']:>7.0f}MB")
+        by_lang = ', '.join(f"{k}: CER {v['cer']:.1%}" for k, v in r['accuracy'].items() if k != 'all')
+        if by_lang:
+            print(f"{'':<18} {by_lang}")
+
+    print_memory(results)
+    print_routing(results)
+
+
+def print_memory(results):
+    """Model footprint and extra memory per inference, by engine and page size"""
+    rows = [(name, r['memory']) for name, r in results['engines'].items() if 'memory' in r]
+    if not rows:
+        return
+    sizes = list(rows[0][1].get('per_inference', {}))
+    header = f"\n{'Engine':<18} {'Model':>8} {'Steady':>8} {'Load peak':>10}"
+    header += ''.join(f" {'+' + size:>10}" for size in sizes)
+    print(header + "   (RSS, MB)")
+    print("-" * (48 + 11 * len(sizes)))
+    for name, m in rows:
+        line = f"{name:<18} {m['model_rss_mb']:>8.0f} {m['steady_after_load_mb']:>8.0f} {m['load_peak_rss_mb']:>10.0f}"
+        for size in sizes:
+            extra = m.get('per_inference', {}).get(size)
+            line += f" {extra['rss_extra_mb']:>10.1f}" if extra else f" {'-':>10}"
+        print(line)
+
+
+def verdict(ci, low, high):
+    """'regression' / 'improvement' only when the whole CI lies beyond a bound"""
+    lo, hi = ci
+    if lo is not None and lo > high:
+        return 'regression'
+    if hi is not None and hi < low:
+        return 'improvement'
+    return 'no significant change'
+
+
+def validate_int8(results):
+    """Record int8 vs fp32 verdicts for every easyocr-<langs>/-int8 pair that ran"""
+    from ocr_int8 import record_validation
+    engines = results['engines']
+    for name, int8 in engines.items():
+        if not (name.startswith('easyocr-') and name.endswith('-int8')):
+            continue
+        fp32 = engines.get(name[:-len('-int8')])
+        if fp32 is None or 'error' in fp32 or 'error' in int8:
+            continue
+        languages = name[len('easyocr-'):-len('-int8')].split('-')
+        v = record_validation(languages, fp32, int8, results['meta']['corpus_hash'])
+        lo, hi = v['cer_delta_ci95']
+        # CIs need at least 2 paired images
+        delta = f"Δ 95% CI [{lo:+.1%}, {hi:+.1%}]" if lo is not None else f"{v['images']} paired images, no CI"
+        ratio = f"x{v['latency_ratio']:.2f}" if v['latency_ratio'] is not None else "-"
+        print(f"\n{'✅' if v['accepted'] else '❌'} int8 {'+'.join(languages)}: CER {v['cer_fp32']:.1%} -> "
+              f"{v['cer_int8']:.1%} ({delta}), latency {ratio} "
+              f"-> {'enabled' if v['accepted'] else 'not enabled'} for VISIONSPEAK_OCR_INT8")
+
+
+def print_routing(results):
+    """Script routing accuracy of mixed-script engines, with calibrated thresholds"""
+    for name, r in results['engines'].items():
+        routing = r.get('routing')
+        if not routing:
+            continue
+        print(f"\nRouting {name}: {'Labels':<8} {'Boxes':>6} {'Accuracy':>9} {'Misrouted':>10} {'Ambiguous':>10}")
+        for key, v in routing.items():
+            if key != 'calibrated':
+                print(f"{'':<{9 + len(name)}} {key:<8} {v['boxes']:>6} {v['accuracy']:>9.1%} "
+                      f"{v['misrouted']:>10} {v['ambiguous']:>10.1%}")
+        best = routing.get('calibrated')
+        if best:
+            lo, hi = best['band']
+            print(f"Calibrated: ARABIC_THRESHOLD = {best['threshold']:.3f}, AMBIGUOUS = ({lo:.3f}, {hi:.3f}) "
+                  f"-> accuracy {best['accuracy']:.1%}, {best['ambiguous']:.1%} ambiguous")
+
+
+def compare(current, baseline, tolerance=0.05, accuracy_tolerance=0.0):
+    """Per-engine verdicts of current against baseline results.
+
+    Both runs must use the same corpus and store per-image character
+    counts (ValueError otherwise): images are paired by file and the bootstrap resamples images, not runs. Latency
+    is flagged only when the whole 95% CI of the median per-image ratio
+    lies beyond 1 +/- tolerance; CER only when the whole 95% CI of the
+    change in pooled CER lies beyond +/- accuracy_tolerance.
+    """
+    if current['meta']['corpus_hash'] != baseline['meta']['corpus_hash']:
+        raise ValueError(f"Different corpora ({current['meta']['corpus_hash']} vs "
+                         f"{baseline['meta']['corpus_hash']}): results cannot be compared")
+    for label, results in (('current', current), ('baseline', baseline)):
+        for name, r in results['engines'].items():
+            if 'error' not in r and any('char_edits' not in s or 'ref_chars' not in s for s in r['samples']):
+                raise ValueError(f"{label} results for {name} have no per-image character counts: "
+                                 f"re-run the benchmark to compare them")
+
+    rows = []
+    for name, cur in current['engines'].items():
+        base = baseline['engines'].get(name)
+        if not base or 'error' in cur or 'error' in base:
+            continue
+        base_samples = {s['file']: s for s in base['samples']}
+        paired = [(s, base_samples[s['file']]) for s in cur['samples'] if s['file'] in base_samples]
+
+        latency_pairs = [(c['latency'], b['latency']) for c, b in paired if b['latency'] > 0]
+        ratio_ci = paired_bootstrap_ci(latency_pairs, median_ratio)
+        cer_pairs = [(c['char_edits'], b['char_edits'], c['ref_chars']) for c, b in paired]
+        cer_ci = paired_bootstrap_ci(cer_pairs, pooled_delta)
+
+        rows.append({
+            'engine': name,
+            'pairs': len(paired),
+            'latency_ratio': median_ratio(latency_pairs) if latency_pairs else None,
+            'latency_ratio_ci95': ratio_ci,
+            'latency': verdict(ratio_ci, 1 - tolerance, 1 + tolerance),
+            'cer_delta': cur['accuracy']['all']['cer'] - base['accuracy']['all']['cer'],
+            'cer_delta_ci95': cer_ci,
+            'cer': verdict(cer_ci, -accuracy_tolerance, accuracy_tolerance),
+            'load_time_ratio': cur['load_time'] / base['load_time'] if base['load_time'] else None,
+        })
+    return rows
+
+
+def print_comparison(rows):
+    print(f"\n{'Engine':<18} {'Latency x':>10} {'95% CI':>15} {'Verdict':<22} "
+          f"{'ΔCER':>7} {'95% CI':>17} {'Verdict':<22}")
+    print("-" * 118)
+    for row in rows:
+        lo, hi = row['latency_ratio_ci95']
+        ci = f"[{lo:.2f}, {hi:.2f}]" if lo is not None else "-"
+        ratio = f"{row['latency_ratio']:.2f}" if row['latency_ratio'] is not None else "-"
+        cer_lo, cer_hi = row['cer_delta_ci95']
+        cer_ci = f"[{cer_lo:+.1%}, {cer_hi:+.1%}]" if cer_lo is not None else "-"
+        print(f"{row['engine']:<18} {ratio:>10} {ci:>15} {row['latency']:<22} "
+              f"{row['cer_delta']:>+7.1%} {cer_ci:>17} {row['cer']:<22}")
+
+
+def main(argv=None):
+    from ocr_corpus import generate_corpus
+    from ocr_engines import ENGINES
+
+    parser = argparse.ArgumentParser(description="OCR accuracy/throughput benchmark")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    gen = sub.add_parser('generate', help="write a synthetic corpus with ground truth")
+    gen.add_argument('--out', default='ocr_corpus')
+    gen.add_argument('--count', type=int, default=60)
+    gen.add_argument('--seed', type=int, default=0)
+    gen.add_argument('--languages', nargs='+', default=['fr', 'en', 'ar'])
+    gen.add_argument('--max-rotation', type=float, default=3.0)
+    gen.add_argument('--max-noise', type=float, default=20.0)
+
+    run = sub.add_parser('run', help="benchmark engines on a corpus")
+    run.add_argument('--corpus', default='ocr_corpus')
+    run.add_argument('--engines', nargs='+', default=list(ENGINES), choices=list(ENGINES))
+    run.add_argument('--warmup', type=int, default=2)
+    run.add_argument('--repeats', type=int, default=3)
+    run.add_argument('--isolation', choices=['sequential', 'concurrent', 'none'], default='sequential')
+    run.add_argument('--cpu-budget', type=int, help="cores to use (default: all available)")
+    run.add_argument('--timeout', type=float, help="seconds allowed per engine process")
+    run.add_argument('--memory-sizes', type=int, nargs='*', default=[640, 1280, 1920],
+                     help="page sizes (longest side, px) for the per-inference memory profile")
+    run.add_argument('--output', default='ocr_bench_results.json')
+    run.add_argument('--baseline', help="results file to compare against")
+
+    routing = sub.add_parser('routing', help="mixed-script routing accuracy of a result file")
+    routing.add_argument('results')
+
+    cmp_ = sub.add_parser('compare', help="compare two result files")
+    cmp_.add_argument('results')
+    cmp_.add_argument('--baseline', required=True)
+    cmp_.add_argument('--tolerance', type=float, default=0.05)
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'generate':
+        manifest = generate_corpus(args.out, args.count, args.seed, tuple(args.languages),
+                                   max_rotation=args.max_rotation, max_noise=args.max_noise)
+        print(f"✅ {manifest['count']} images written to {args.out} (hash {manifest['hash']})")
+        return 0
+
+    if args.command == 'routing':
+        with open(args.results, encoding='utf-8') as f:
+            results = json.load(f)
+        if not any('routing' in r for r in results['engines'].values()):
+            print("No routing data: run the benchmark with --engines easyocr-mixed")
+            return 1
+        print_routing(results)
+        return 0
+
+    if args.command == 'run':
+        results = run_suite(args.corpus, args.engines, args.warmup, args.repeats,
+                            args.isolation, args.cpu_budget, args.timeout, args.memory_sizes)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print_results(results)
+        validate_int8(results)
+        print(f"\n⏱️  {results['meta']['wall_time']:.1f}s ({args.isolation})")
+        print(f"💾 {args.output}")
+        if not args.baseline:
+            return 0
+        current = results
+        baseline_path, tolerance = args.baseline, 0.05
+    else:
+        with open(args.results, encoding='utf-8') as f:
+            current = json.load(f)
+        baseline_path, tolerance = args.baseline, args.tolerance
+
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f)
+    try:
+        rows = compare(current, baseline, tolerance)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 2
+    print_comparison(rows)
+    # Non-zero exit lets CI fail on a significant regression
+    return 1 if any('regression' in (r['latency'], r['cer']) for r in rows) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,223 @@
+import hashlib
+import json
+import random
+from pathlib import Path
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+# Textes de test, partagés avec le benchmark TTS
+from bench_common import PHRASES, TEXTE_ANGLAIS, TEXTE_ARABE, TEXTE_FRANCAIS  # noqa: F401
+
+# For proper Arabic text rendering
+try:
+    import arabic_reshaper
+    from bidi.algorithm import get_display
+    ARABIC_SUPPORT = True
+except ImportError:
+    ARABIC_SUPPORT = False
+
+# (path, name, supports Arabic)
+FONTS = [
+    ("C:/Windows/Fonts/tahoma.ttf", "Tahoma", True),
+    ("C:/Windows/Fonts/tahomabd.ttf", "Tahoma Bold", True),
+    ("C:/Windows/Fonts/arial.ttf", "Arial", True),
+    ("C:/Windows/Fonts/calibri.ttf", "Calibri", False),
+    ("C:/Windows/Fonts/times.ttf", "Times New Roman", True),
+    ("C:/Windows/Fonts/cour.ttf", "Courier New", True),
+    ("tahoma.ttf", "Tahoma", True),
+    ("arial.ttf", "Arial", True),
+    ("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", "DejaVu Sans", True),
+    ("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", "DejaVu Sans Bold", True),
+    ("/usr/share/fonts/truetype/dejavu/DejaVuSerif.ttf", "DejaVu Serif", False),
+    ("/usr/share/fonts/truetype/dejavu/DejaVuSansMono.ttf", "DejaVu Sans Mono", False),
+    ("/usr/share/fonts/truetype/noto/NotoNaskhArabic-Regular.ttf", "Noto Naskh Arabic", True),
+    ("/usr/share/fonts/truetype/noto/NotoSans-Regular.ttf", "Noto Sans", False),
+    ("/Library/Fonts/Arial.ttf", "Arial", True),
+]
+
+def preparer_texte_arabe(texte):
+    """Reshape + bidi so PIL draws Arabic correctly (ground truth stays logical)"""
+    if ARABIC_SUPPORT:
+        # Reshape Arabic text for proper display
+        reshaped_text = arabic_reshaper.reshape(texte)
+        # Apply bidirectional algorithm
+        return get_display(reshaped_text)
+    return texte
+
+
+def available_fonts(arabic=False):
+    """[(path, name)] of the fonts from FONTS present on this machine"""
+    fonts = []
+    seen = set()
+    for path, name, has_arabic in FONTS:
+        if name in seen or (arabic and not has_arabic):
+            continue
+        try:
+            ImageFont.truetype(path, 12)
+        except OSError:
+            continue
+        seen.add(name)
+        fonts.append((path, name))
+    return fonts
+
+
+def charger_police(taille=20):
+    """First usable Arabic-capable font, or PIL's default font: (font, name)"""
+    for path, name in available_fonts(arabic=True):
+        return ImageFont.truetype(path, taille), name
+    return ImageFont.load_default(), "Police par défaut"
+
+
+def dessiner_image_test(font=None):
+    """The original 900x700 French/Arabic/English comparison image"""
+    if font is None:
+        font, _ = charger_police(20)
+
+    img = Image.new('RGB', (900, 700), color='white')
+    d = ImageDraw.Draw(img)
+
+    # Position Y pour dessiner le texte
+    y_position = 40
+    line_height = 30  # Espacement augmenté entre les lignes
+
+    d.text((30, y_position), "=== FRANÇAIS ===", fill='blue', font=font)
+    y_position += line_height + 10
+    for ligne in TEXTE_FRANCAIS.split('\n'):
+        d.text((30, y_position), ligne, fill='black', font=font)
+        y_position += line_height
+
+    y_position += 30
+
+    # Dessiner le texte arabe (avec support RTL si disponible)
+    d.text((30, y_position), "=== العربية (ARABE) ===", fill='blue', font=font)
+    y_position += line_height + 10
+    if ARABIC_SUPPORT:
+        for ligne in TEXTE_ARABE.split('\n'):
+            d.text((30, y_position), preparer_texte_arabe(ligne), fill='black', font=font)
+            y_position += line_height
+    else:
+        # Sans support, on écrit quand même pour tester
+        d.text((30, y_position), TEXTE_ARABE, fill='black', font=font)
+        y_position += 150
+
+    y_position += 30
+
+    d.text((30, y_position), "=== ENGLISH ===", fill='blue', font=font)
+    y_position += line_height + 10
+    for ligne in TEXTE_ANGLAIS.split('\n'):
+        d.text((30, y_position), ligne, fill='black', font=font)
+        y_position += line_height
+
+    return img
+
+
+def texte_image_test():
+    """Ground truth of dessiner_image_test(), titles included, top to bottom"""
+    return '\n'.join((
+        "=== FRANÇAIS ===", TEXTE_FRANCAIS,
+        "=== العربية (ARABE) ===", TEXTE_ARABE,
+        "=== ENGLISH ===", TEXTE_ANGLAIS,
+    ))
+
+
+# ----------------------------------------------------------------------
+# Synthetic corpus
+# ----------------------------------------------------------------------
+
+def render_sample(lines, lang, font_path, font_size, rotation=0.0, noise=0.0, seed=0, margin=30):
+    """Draw lines of text on a white page, then rotate and add gaussian noise"""
+    font = ImageFont.truetype(font_path, font_size)
+    drawn = [preparer_texte_arabe(line) if lang == 'ar' else line for line in lines]
+
+    line_height = int(font_size * 1.5)
+    probe = ImageDraw.Draw(Image.new('RGB', (1, 1)))
+    width = max(int(probe.textlength(line, font=font)) for line in drawn) + 2 * margin
+    height = line_height * len(drawn) + 2 * margin
+
+    img = Image.new('RGB', (width, height), color='white')
+    d = ImageDraw.Draw(img)
+    for i, line in enumerate(drawn):
+        if lang == 'ar':
+            # Right-aligned, like a real Arabic page
+            x = width - margin - int(d.textlength(line, font=font))
+        else:
+            x = margin
+        d.text((x, margin + i * line_height), line, fill='black', font=font)
+
+    if rotation:
+        img = img.rotate(rotation, resample=Image.BICUBIC, expand=True, fillcolor='white')
+    if noise:
+        pixels = np.asarray(img, dtype=np.float32)
+        pixels += np.random.default_rng(seed).normal(0, noise, pixels.shape)
+        img = Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8))
+    return img
+
+
+def generate_corpus(out_dir, count=30, seed=0, languages=('fr', 'en', 'ar'),
+                    sizes=(14, 36), max_rotation=3.0, max_noise=20.0, lines_per_sample=(1, 5)):
+    """Write count PNG samples + manifest.json (ground truth and render params)"""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(seed)
+
+    fonts = {'latin': available_fonts(), 'arabic': available_fonts(arabic=True)}
+    if not fonts['latin']:
+        raise RuntimeError("No TrueType font found; add one to ocr_corpus.FONTS")
+    if 'ar' in languages and not (ARABIC_SUPPORT and fonts['arabic']):
+        print("⚠️  Arabic samples skipped (needs arabic-reshaper, python-bidi and an Arabic font)")
+        languages = tuple(lang for lang in languages if lang != 'ar')
+
+    samples = []
+    for i in range(count):
+        lang = languages[i % len(languages)]
+        font_path, font_name = rng.choice(fonts['arabic'] if lang == 'ar' else fonts['latin'])
+        n_lines = rng.randint(*lines_per_sample)
+        lines = rng.sample(PHRASES[lang], min(n_lines, len(PHRASES[lang])))
+        params = {
+            'font': font_name,
+            'font_size': rng.randint(*sizes),
+            'rotation': round(rng.uniform(-max_rotation, max_rotation), 2),
+            'noise': round(rng.uniform(0, max_noise), 1),
+            'noise_seed': rng.randrange(2 ** 32),
+        }
+
+        img = render_sample(lines, lang, font_path, params['font_size'], params['rotation'],
+                            params['noise'], params['noise_seed'])
+        filename = f'sample_{i:04d}_{lang}.png'
+        img.save(out_dir / filename)
+        samples.append({
+            'file': filename,
+            'lang': lang,
+            'ground_truth': '\n'.join(lines),
+            'width': img.width,
+            'height': img.height,
+            **params,
+        })
+
+    manifest = {
+        'seed': seed,
+        'count': len(samples),
+        'languages': list(languages),
+        'samples': samples,
+    }
+    manifest['hash'] = corpus_hash(manifest)
+    with open(out_dir / 'manifest.json', 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return manifest
+
+
+def corpus_hash(manifest):
+    """Identifies a corpus so results are only compared on the same data"""
+    payload = json.dumps(manifest['samples'], ensure_ascii=False, sort_keys=True)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:12]
+
+
+def load_corpus(corpus_dir):
+    """manifest dict; each sample gets an absolute 'path'"""
+    corpus_dir = Path(corpus_dir)
+    with open(corpus_dir / 'manifest.json', encoding='utf-8') as f:
+        manifest = json.load(f)
+    for sample in manifest['samples']:
+        sample['path'] = str(corpus_dir / sample['file'])
+    return manifest
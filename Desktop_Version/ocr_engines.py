@@ -0,0 +1,182 @@
+import os
+
+import numpy as np
+
+
+def contient_arabe(s):
+    """True when s contains Arabic letters"""
+    return any('\u0600' <= c <= '\u06FF' for c in s)
+
+
+def group_lines(detections):
+    """Group easyocr-style (bbox, text, conf) detections into lines in reading order.
+
+    Boxes whose vertical centres fall within half a box height of each
+    other are treated as one line. Lines read left to right, or right to
+    left when they contain Arabic.
+    """
+    boxes = []
+    for detection in detections:
+        ys = [p[1] for p in detection[0]]
+        xs = [p[0] for p in detection[0]]
+        boxes.append(((min(ys) + max(ys)) / 2.0, max(ys) - min(ys), min(xs), detection))
+    boxes.sort(key=lambda b: b[0])
+
+    lines = []
+    for box in boxes:
+        if lines and abs(box[0] - lines[-1][-1][0]) < max(box[1], lines[-1][-1][1]) / 2.0:
+            lines[-1].append(box)
+        else:
+            lines.append([box])
+
+    ordered = []
+    for line in lines:
+        rtl = any(contient_arabe(b[3][1]) for b in line)
+        line.sort(key=lambda b: b[2], reverse=rtl)
+        ordered.append([b[3] for b in line])
+    return ordered
+
+
+def reading_order(detections):
+    """Detections sorted line by line (see group_lines)"""
+    return [d for line in group_lines(detections) for d in line]
+
+
+def join_detections(detections):
+    """Detections as text, one line per text line"""
+    return '\n'.join(' '.join(d[1] for d in line) for line in group_lines(detections))
+
+
+class OCREngine:
+    """Common interface for the engines compared in OCR.py and ocr_bench.py.
+
+    load() does all model loading (timed as cold start), recognize() takes
+    an RGB numpy array and returns the text with one line per text line.
+    """
+
+    name = 'engine'
+
+    def load(self):
+        pass
+
+    def recognize(self, image):
+        raise NotImplementedError
+
+    def details(self):
+        """Engine-specific diagnostics of the last recognize() call, or None"""
+        return None
+
+    def close(self):
+        pass
+
+
+class TesseractEngine(OCREngine):
+    name = 'tesseract'
+
+    def __init__(self, lang='eng+fra+ara'):
+        self.lang = lang
+
+    def load(self):
+        import pytesseract
+        self.pytesseract = pytesseract
+        # Configuration Tesseract
+        cmd = os.environ.get('TESSERACT_CMD', r'C:\Program Files\Tesseract-OCR\tesseract.exe')
+        if os.path.exists(cmd):
+            pytesseract.pytesseract.tesseract_cmd = cmd
+        if 'ara' in self.lang.split('+') and 'ara' not in pytesseract.get_languages(config=''):
+            print("⚠️  ara.traineddata absent, Tesseract sans arabe")
+            self.lang = '+'.join(l for l in self.lang.split('+') if l != 'ara')
+
+    def recognize(self, image):
+        return self.pytesseract.image_to_string(image, lang=self.lang).strip()
+
+
+class InProcessTesseractEngine(OCREngine):
+    """Tesseract kept loaded in-process (tesserocr) instead of one subprocess per call"""
+
+    name = 'tesseract-inproc'
+
+    def __init__(self, lang='eng+fra+ara'):
+        self.lang = lang
+
+    def load(self):
+        from tesseract_engine import TesseractPool
+        self.pool = TesseractPool(self.lang, size=1)
+
+    def recognize(self, image):
+        return self.pool.recognize(image, details=False)['text']
+
+    def close(self):
+        self.pool.close()
+
+
+class EasyOCREngine(OCREngine):
+    def __init__(self, languages=('fr', 'en'), int8=False):
+        self.languages = list(languages)
+        self.int8 = int8
+        self.name = 'easyocr-' + '-'.join(self.languages) + ('-int8' if int8 else '')
+
+    def load(self):
+        from ocr_int8 import create_reader
+        # int8 is explicit here, the VISIONSPEAK_OCR_INT8 setting does not apply
+        self.reader = create_reader(self.languages, int8=self.int8, verbose=False)
+
+    def recognize(self, image):
+        return join_detections(self.reader.readtext(image, detail=1))
+
+
+class MixedScriptEngine(OCREngine):
+    """Single detection pass, Latin/Arabic lines routed to their own recognizer"""
+
+    name = 'easyocr-mixed'
+
+    def load(self):
+        from mixed_script import MixedScriptReader
+        self.reader = MixedScriptReader(('fr', 'en'), ('ar', 'en'))
+
+    def recognize(self, image):
+        return join_detections(self.reader.readtext(image, detail=1))
+
+    def details(self):
+        # Per-box script scores and routes, checked against the corpus labels
+        return {'routing': self.reader.last_routing}
+
+
+class DoctrEngine(OCREngine):
+    name = 'doctr'
+
+    def load(self):
+        from doctr.models import ocr_predictor
+        self.model = ocr_predictor(pretrained=True)
+
+    def recognize(self, image):
+        result = self.model([np.ascontiguousarray(image)])
+        lines = []
+        for page in result.pages:
+            for block in page.blocks:
+                for line in block.lines:
+                    lines.append(' '.join(word.value for word in line.words))
+        return '\n'.join(lines)
+
+
+ENGINES = {
+    'tesseract': lambda: TesseractEngine('eng+fra+ara'),
+    'tesseract-inproc': lambda: InProcessTesseractEngine('eng+fra+ara'),
+    'easyocr-fr-en': lambda: EasyOCREngine(['fr', 'en']),
+    'easyocr-ar-en': lambda: EasyOCREngine(['ar', 'en']),
+    'easyocr-fr-en-int8': lambda: EasyOCREngine(['fr', 'en'], int8=True),
+    'easyocr-ar-en-int8': lambda: EasyOCREngine(['ar', 'en'], int8=True),
+    'easyocr-mixed': MixedScriptEngine,
+    'doctr': DoctrEngine,
+}
+
+
+def create_engine(name):
+    """New (not yet loaded) engine from ENGINES"""
+    try:
+        factory = ENGINES[name]
+    except KeyError:
+        raise ValueError(f"Unknown engine '{name}', choose from: {', '.join(ENGINES)}")
+    engine = factory()
+    engine.name = name
+    return engine
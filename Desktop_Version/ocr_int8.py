@@ -0,0 +1,492 @@
+"""Int8 CPU inference for EasyOCR on ONNX Runtime.
+
+EasyOCR's own CPU quantization (torch quantize_dynamic, on by default)
+only touches Linear and LSTM layers, so the CRAFT detector - convolutions
+only, and most of the time per page - always runs in fp32. Here:
+
+- the detector is exported to ONNX and statically quantized to int8
+  (QDQ, per-channel weights), activation ranges calibrated on rendered
+  French/English/Arabic pages;
+- the recognizer is exported to ONNX with dynamic int8 quantization.
+
+Both files are built once per machine (~/.EasyOCR/int8/) and later
+readers load them instead of the fp32 .pth weights, which is smaller on
+disk and faster to load. The returned object is a regular easyocr.Reader
+with the two networks swapped, so readtext/detect/recognize work as usual.
+
+    reader = create_reader(['en', 'fr'], int8=True)
+
+int8=None follows the VISIONSPEAK_OCR_INT8 environment variable, which is
+how App.py and server.py select it. Requires: pip install onnx onnxruntime
+
+That setting only takes effect for languages whose int8 models passed a
+comparison with fp32 on the benchmark corpus (CER not worse by more than
+MAX_CER_INCREASE, and faster), recorded in ~/.EasyOCR/int8/validation.json
+by the benchmark run below, together with a fingerprint of the measured
+model files and EasyOCR version. Without it, after the models are rebuilt
+or EasyOCR is upgraded, or when the models cannot be built or loaded, the
+readers fall back to fp32 with a warning.
+
+    python ocr_int8.py build --langs en fr     # build ahead of time, print sizes
+    python ocr_bench.py run --corpus ocr_corpus --engines easyocr-fr-en easyocr-fr-en-int8
+    python ocr_int8.py status                  # recorded comparisons
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+INT8_ENV = 'VISIONSPEAK_OCR_INT8'
+CALIBRATION_SIDE = 640  # longest side of the calibration pages fed to the detector
+CALIBRATION_PAGES = 24
+ONNX_OPSET = 13
+MB = 1024 * 1024
+# Largest CER increase over fp32 (upper end of the 95% CI) accepted for int8
+MAX_CER_INCREASE = 0.01
+VALIDATION_FILE = 'validation.json'
+
+
+def int8_enabled(value=None):
+    """The int8 argument, or the VISIONSPEAK_OCR_INT8 environment variable when None"""
+    if value is not None:
+        return bool(value)
+    return os.environ.get(INT8_ENV, '').lower() in ('1', 'true', 'yes')
+
+
+def model_dir():
+    """Folder of the int8 models, next to EasyOCR's own model files"""
+    base = os.environ.get('EASYOCR_MODULE_PATH') or os.environ.get('MODULE_PATH') or os.path.expanduser('~/.EasyOCR')
+    return Path(base) / 'int8'
+
+
+def model_paths(model_lang, directory=None):
+    """CRAFT is the same for every language; the recognizer depends on the script"""
+    directory = Path(directory) if directory else model_dir()
+    return {
+        'detector': directory / 'craft_int8.onnx',
+        'recognizer': directory / f'recognizer_{model_lang}_int8.onnx',
+    }
+
+
+# ==========================================
+# ONNX RUNTIME STAND-INS FOR THE TORCH MODULES
+# ==========================================
+
+def _session(path):
+    import onnxruntime as ort
+    import torch
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    # Same thread budget as torch (set by resource_governor)
+    options.intra_op_num_threads = torch.get_num_threads()
+    options.inter_op_num_threads = 1
+    return ort.InferenceSession(str(path), options, providers=['CPUExecutionProvider'])
+
+
+class OnnxDetector:
+    """Called like EasyOCR's CRAFT module: net(x) -> (score maps, feature)"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.session = _session(path)
+        self.input = self.session.get_inputs()[0].name
+
+    def __call__(self, x):
+        import torch
+        scores = self.session.run(None, {self.input: x.cpu().numpy().astype(np.float32, copy=False)})[0]
+        # The feature map only feeds EasyOCR's optional refiner, not exported
+        return torch.from_numpy(scores), None
+
+    def eval(self):
+        return self
+
+    def to(self, device):
+        return self
+
+
+class OnnxRecognizer:
+    """Called like EasyOCR's recognizer: model(image, text) -> per-step logits"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.session = _session(path)
+        self.input = self.session.get_inputs()[0].name
+
+    def __call__(self, image, text=None):
+        import torch
+        logits = self.session.run(None, {self.input: image.cpu().numpy().astype(np.float32, copy=False)})[0]
+        return torch.from_numpy(logits)
+
+    def eval(self):
+        return self
+
+    def to(self, device):
+        return self
+
+
+# ==========================================
+# EXPORT AND QUANTIZATION
+# ==========================================
+
+def calibration_pages(count=CALIBRATION_PAGES, seed=0):
+    """Rendered fr/en/ar pages, drawn like the benchmark corpus (ocr_corpus.py)"""
+    from ocr_corpus import PHRASES, available_fonts, render_sample
+    rng = random.Random(seed)
+    pages = []
+    for i in range(count):
+        lang = ('fr', 'en', 'ar')[i % 3]
+        fonts = available_fonts(arabic=(lang == 'ar'))
+        if not fonts:
+            continue
+        font_path, _ = rng.choice(fonts)
+        lines = rng.sample(PHRASES[lang], min(4, len(PHRASES[lang])))
+        page = render_sample(lines, lang, font_path, rng.randint(16, 44),
+                             rotation=rng.uniform(-3, 3), noise=rng.uniform(0, 12), seed=seed + i)
+        pages.append(np.asarray(page))
+    if not pages:
+        # No TrueType font on this machine: OpenCV's built-in font (Latin only)
+        import cv2
+        for i in range(count):
+            page = np.full((200, 640, 3), 255, dtype=np.uint8)
+            for j, line in enumerate(rng.sample(PHRASES['en'], 3)):
+                cv2.putText(page, line[:40], (10, 50 + 50 * j), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 0), 2)
+            pages.append(page)
+    return pages
+
+
+def _detector_inputs(images):
+    """Pages preprocessed exactly as EasyOCR does before CRAFT"""
+    import cv2
+    from easyocr.imgproc import normalizeMeanVariance, resize_aspect_ratio
+    for image in images:
+        resized, _, _ = resize_aspect_ratio(image, CALIBRATION_SIDE, interpolation=cv2.INTER_LINEAR, mag_ratio=1.0)
+        yield np.transpose(normalizeMeanVariance(resized), (2, 0, 1))[None].astype(np.float32)
+
+
+def _export_onnx(module, example, path, dynamic_axes):
+    import torch
+    module.eval()
+    names = list(dynamic_axes)
+    kwargs = dict(input_names=names[:1], output_names=names[1:], dynamic_axes=dynamic_axes,
+                  opset_version=ONNX_OPSET, do_constant_folding=True)
+    with torch.no_grad():
+        try:
+            # TorchScript exporter: handles CRAFT's size-dependent upsampling
+            torch.onnx.export(module, example, str(path), dynamo=False, **kwargs)
+        except TypeError:  # torch < 2.5 has no dynamo argument
+            torch.onnx.export(module, example, str(path), **kwargs)
+
+
+def export_detector(reader, path):
+    """fp32 ONNX export of the reader's CRAFT network (score maps only)"""
+    import torch
+
+    class Scores(torch.nn.Module):
+        def __init__(self, craft):
+            super().__init__()
+            self.craft = craft
+
+        def forward(self, x):
+            return self.craft(x)[0]
+
+    craft = getattr(reader.detector, 'module', reader.detector)  # unwrap DataParallel
+    example = torch.zeros(1, 3, CALIBRATION_SIDE, CALIBRATION_SIDE)
+    _export_onnx(Scores(craft), (example,), path, {
+        'image': {0: 'batch', 2: 'height', 3: 'width'},
+        'scores': {0: 'batch', 1: 'rows', 2: 'cols'},
+    })
+
+
+def export_recognizer(reader, path):
+    """fp32 ONNX export of the reader's recognizer (CTC logits)"""
+    import torch
+
+    class Logits(torch.nn.Module):
+        def __init__(self, model):
+            super().__init__()
+            self.model = model
+
+        def forward(self, image):
+            # The text argument is only used by attention decoders, not CTC
+            return self.model(image, None)
+
+    model = getattr(reader.recognizer, 'module', reader.recognizer)
+    example = torch.zeros(1, 1, getattr(reader, 'imgH', 64), 256)
+    _export_onnx(Logits(model), (example,), path, {
+        'image': {0: 'batch', 3: 'width'},
+        'logits': {0: 'batch', 1: 'steps'},
+    })
+
+
+def quantize_detector(fp32_path, int8_path, images):
+    """Static int8 quantization, activation ranges calibrated on images"""
+    from onnxruntime.quantization import CalibrationDataReader, QuantFormat, QuantType, quantize_static
+
+    class Pages(CalibrationDataReader):
+        def __init__(self):
+            self.inputs = _detector_inputs(images)
+
+        def get_next(self):
+            x = next(self.inputs, None)
+            return None if x is None else {'image': x}
+
+    quantize_static(str(fp32_path), str(int8_path), Pages(), quant_format=QuantFormat.QDQ,
+                    per_channel=True, activation_type=QuantType.QUInt8, weight_type=QuantType.QInt8)
+
+
+def quantize_recognizer(fp32_path, int8_path):
+    """Dynamic int8 quantization (weights int8, activations quantized per batch)"""
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    quantize_dynamic(str(fp32_path), str(int8_path), weight_type=QuantType.QInt8)
+
+
+def build_int8_models(lang_list, images=None, directory=None, force=False):
+    """Export and quantize the detector and the recognizer of lang_list.
+
+    Returns {'detector'|'recognizer': {'path', 'fp32_mb', 'int8_mb', 'seconds'}}
+    for the models built (existing files are kept unless force=True).
+    """
+    import easyocr
+    # Loads no weights: only resolves the languages to a recognition model
+    probe = easyocr.Reader(list(lang_list), gpu=False, verbose=False, detector=False, recognizer=False)
+    paths = model_paths(probe.model_lang, directory)
+    todo = [name for name, path in paths.items() if force or not path.exists()]
+    if not todo:
+        return {}
+    paths['detector'].parent.mkdir(parents=True, exist_ok=True)
+    # quantize=False: EasyOCR's torch-quantized layers cannot be exported
+    reader = easyocr.Reader(list(lang_list), gpu=False, verbose=False, quantize=False)
+
+    steps = {
+        'detector': (export_detector, lambda src, dst: quantize_detector(
+            src, dst, images if images is not None else calibration_pages())),
+        'recognizer': (export_recognizer, quantize_recognizer),
+    }
+    report = {}
+    for name in todo:
+        export, quantize = steps[name]
+        path = paths[name]
+        start = time.perf_counter()
+        fp32 = path.with_name(f'.{path.stem}.fp32.onnx')
+        tmp = path.with_name(f'.{path.name}.tmp')
+        try:
+            export(reader, fp32)
+            quantize(fp32, tmp)
+            report[name] = {
+                'path': str(path),
+                'fp32_mb': fp32.stat().st_size / MB,
+                'int8_mb': tmp.stat().st_size / MB,
+                'seconds': time.perf_counter() - start,
+            }
+            # Atomic: another process may be loading the models meanwhile
+            os.replace(tmp, path)
+        finally:
+            for leftover in (fp32, tmp):
+                if leftover.exists():
+                    leftover.unlink()
+    return report
+
+
+# ==========================================
+# VALIDATION AGAINST FP32
+# ==========================================
+
+def _validation_key(lang_list):
+    return '+'.join(sorted(lang_list))
+
+
+def _model_lang(lang_list):
+    import easyocr
+    # Loads no weights: only resolves the languages to a recognition model
+    return easyocr.Reader(list(lang_list), gpu=False, verbose=False, detector=False, recognizer=False).model_lang
+
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(MB), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def model_fingerprint(lang_list, directory=None):
+    """SHA-256 of the int8 model files for lang_list (None if missing) and the EasyOCR version"""
+    from importlib.metadata import version
+    paths = model_paths(_model_lang(lang_list), directory)
+    fingerprint = {name: _sha256(path) if path.exists() else None for name, path in paths.items()}
+    fingerprint['easyocr'] = version('easyocr')
+    return fingerprint
+
+
+def load_validations(directory=None):
+    path = (Path(directory) if directory else model_dir()) / VALIDATION_FILE
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def compare_with_fp32(fp32, int8, max_cer_increase=MAX_CER_INCREASE):
+    """Paired comparison of two ocr_bench engine results on the same corpus.
+
+    int8 is accepted when the 95% CI of its CER increase stays below
+    max_cer_increase and the whole CI of the latency ratio is below 1.
+    """
+    from bench_common import median_ratio, paired_bootstrap_ci, pooled_delta
+    base = {s['file']: s for s in fp32['samples']}
+    paired = [(s, base[s['file']]) for s in int8['samples'] if s['file'] in base]
+    latency_pairs = [(c['latency'], b['latency']) for c, b in paired if b['latency'] > 0]
+    cer_pairs = [(c['char_edits'], b['char_edits'], c['ref_chars']) for c, b in paired]
+    cer_ci = paired_bootstrap_ci(cer_pairs, pooled_delta)
+    ratio_ci = paired_bootstrap_ci(latency_pairs, median_ratio)
+    return {
+        'images': len(paired),
+        'cer_fp32': fp32['accuracy']['all']['cer'],
+        'cer_int8': int8['accuracy']['all']['cer'],
+        'cer_delta_ci95': cer_ci,
+        'latency_ratio': median_ratio(latency_pairs) if latency_pairs else None,
+        'latency_ratio_ci95': ratio_ci,
+        'load_time_fp32': fp32['load_time'],
+        'load_time_int8': int8['load_time'],
+        'accepted': cer_ci[1] is not None and cer_ci[1] <= max_cer_increase
+                    and ratio_ci[1] is not None and ratio_ci[1] < 1.0,
+    }
+
+
+def record_validation(lang_list, fp32, int8, corpus_hash, directory=None):
+    """Compare int8 with fp32 results and store the verdict next to the models"""
+    from datetime import datetime
+    verdict = compare_with_fp32(fp32, int8)
+    verdict.update({
+        'languages': sorted(lang_list),
+        'models': model_fingerprint(lang_list, directory),
+        'corpus_hash': corpus_hash,
+        'date': datetime.now().isoformat(timespec='seconds'),
+        'max_cer_increase': MAX_CER_INCREASE,
+    })
+    directory = Path(directory) if directory else model_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    validations = load_validations(directory)
+    validations[_validation_key(lang_list)] = verdict
+    tmp = directory / f'.{VALIDATION_FILE}.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(validations, f, indent=2)
+    os.replace(tmp, directory / VALIDATION_FILE)
+    return verdict
+
+
+def validated(lang_list, directory=None):
+    """True when the int8 models for lang_list, as they are now, passed the comparison with fp32"""
+    verdict = load_validations(directory).get(_validation_key(lang_list))
+    if not (verdict and verdict.get('accepted')):
+        return False
+    # A rebuild or an EasyOCR upgrade changes the models that were measured
+    return verdict.get('models') == model_fingerprint(lang_list, directory)
+
+
+# ==========================================
+# READERS
+# ==========================================
+
+def _converter(reader, lang_list):
+    """The CTC label converter EasyOCR would have built with its recognizer"""
+    from easyocr.config import BASE_PATH
+    from easyocr.utils import CTCLabelConverter
+    dict_list = {lang: os.path.join(BASE_PATH, 'dict', lang + '.txt') for lang in lang_list}
+    return CTCLabelConverter(reader.character, {}, dict_list)
+
+
+def load_int8_reader(lang_list, detector=True, directory=None, build=True, verbose=False):
+    """easyocr.Reader running the int8 ONNX models (built on first use if build=True)"""
+    import onnxruntime  # noqa: F401 - fail before anything is loaded
+    import easyocr
+    from easyocr.detection import get_textbox
+
+    # Loads no weights: only resolves the languages to a recognition model
+    reader = easyocr.Reader(list(lang_list), gpu=False, verbose=verbose, detector=False, recognizer=False)
+    paths = model_paths(reader.model_lang, directory)
+    needed = [paths['recognizer']] + ([paths['detector']] if detector else [])
+    if not all(path.exists() for path in needed):
+        if not build:
+            raise FileNotFoundError(f"int8 models missing in {paths['detector'].parent}; run: python ocr_int8.py build")
+        print("⚙️  Building int8 EasyOCR models (once per machine)...")
+        for name, info in build_int8_models(lang_list, directory=directory).items():
+            print(f"   {name}: {info['fp32_mb']:.1f} MB fp32 -> {info['int8_mb']:.1f} MB int8 ({info['seconds']:.0f}s)")
+
+    if detector:
+        reader.detect_network = 'craft'
+        reader.get_textbox = get_textbox
+        reader.detector = OnnxDetector(paths['detector'])
+    reader.recognizer = OnnxRecognizer(paths['recognizer'])
+    reader.converter = _converter(reader, lang_list)
+    reader.int8 = {name: str(path) for name, path in paths.items() if path in needed}
+    return reader
+
+
+def create_reader(lang_list, int8=None, gpu=False, **kwargs):
+    """easyocr.Reader, or its int8 variant when int8 (or VISIONSPEAK_OCR_INT8) is set.
+
+    Through VISIONSPEAK_OCR_INT8 (int8=None), int8 is only used for
+    models validated against fp32 (see validated()); int8=True skips
+    that check, which is how the benchmark measures it. Any failure to
+    build or load the int8 models falls back to fp32.
+    """
+    use_int8 = int8_enabled(int8) and not gpu
+    if use_int8 and int8 is None and not validated(lang_list):
+        print(f"⚠️  int8 OCR models for {'+'.join(lang_list)} not validated against fp32 (or changed since); "
+              f"using fp32 EasyOCR. Run: "
+              f"python ocr_bench.py run --engines easyocr-{'-'.join(lang_list)} easyocr-{'-'.join(lang_list)}-int8")
+        use_int8 = False
+    if use_int8:
+        try:
+            return load_int8_reader(lang_list, detector=kwargs.get('detector', True),
+                                    verbose=kwargs.get('verbose', False))
+        except ImportError as e:
+            print(f"⚠️  int8 OCR unavailable ({e}); using fp32 EasyOCR. Install with: pip install onnx onnxruntime")
+        except Exception as e:
+            # Export, quantization or ONNX Runtime session failure
+            print(f"⚠️  int8 OCR models could not be built or loaded ({type(e).__name__}: {e}); using fp32 EasyOCR")
+    import easyocr
+    return easyocr.Reader(list(lang_list), gpu=gpu, **kwargs)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the int8 EasyOCR models")
+    sub = parser.add_subparsers(dest='command', required=True)
+    build = sub.add_parser('build', help="export + quantize (run once per machine)")
+    build.add_argument('--langs', nargs='+', default=['en', 'fr'])
+    build.add_argument('--force', action='store_true', help="rebuild existing models")
+    sub.add_parser('status', help="show the recorded comparisons with fp32")
+    args = parser.parse_args(argv)
+
+    if args.command == 'status':
+        validations = load_validations()
+        if not validations:
+            print(f"No comparison recorded in {model_dir()}; run ocr_bench.py with fp32 and int8 engines")
+        for key, v in validations.items():
+            lo, hi = v['latency_ratio_ci95']
+            ratio = f"x{v['latency_ratio']:.2f} [{lo:.2f}, {hi:.2f}]" if lo is not None else "-"
+            current = v.get('models') == model_fingerprint(v['languages'])
+            print(f"{'✅' if v['accepted'] and current else '❌'} {key}: CER {v['cer_fp32']:.1%} fp32 -> "
+                  f"{v['cer_int8']:.1%} int8, latency {ratio}, {v['images']} images, corpus {v['corpus_hash']} "
+                  f"({v['date']}){'' if current else ' - models changed since, re-run the comparison'}")
+        return 0
+
+    report = build_int8_models(args.langs, force=args.force)
+    if not report:
+        print(f"✅ Models already built in {model_dir()} (--force to rebuild)")
+    for name, info in report.items():
+        print(f"✅ {name}: {info['fp32_mb']:.1f} MB fp32 -> {info['int8_mb']:.1f} MB int8 "
+              f"in {info['seconds']:.0f}s ({info['path']})")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,126 @@
+import gc
+import sys
+import threading
+import time
+import tracemalloc
+
+MB = 1024 * 1024
+
+
+def current_rss_mb():
+    """Resident set size of this process right now"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / MB
+    except ImportError:
+        pass
+    try:
+        # Linux without psutil
+        import os
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / MB
+    except (OSError, ValueError):
+        return peak_rss_mb()
+
+
+def peak_rss_mb():
+    """Process high-water RSS in MB (covers everything loaded so far)"""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports KB, macOS bytes
+        return peak / MB if sys.platform == 'darwin' else peak / 1024
+    except ImportError:
+        import psutil
+        info = psutil.Process().memory_info()
+        return getattr(info, 'peak_wset', info.rss) / MB
+
+
+class MemoryProbe:
+    """Peak RSS (sampled on a thread) and peak traced allocation over a block.
+
+    RSS covers everything including torch/tesseract native buffers;
+    tracemalloc only sees allocations made through Python's allocators
+    (Python objects and numpy arrays). Use trace=False around timed code,
+    tracemalloc slows allocation-heavy code down noticeably.
+
+        with MemoryProbe() as probe:
+            engine.recognize(image)
+        probe.result  # {'rss_before', 'rss_peak', 'rss_after', 'rss_extra', 'traced_peak'}
+    """
+
+    def __init__(self, interval=0.005, trace=True):
+        self.interval = interval
+        self.trace = trace
+        self.result = {}
+        self._stop = threading.Event()
+        self._peak = 0.0
+
+    def _sample(self):
+        while not self._stop.is_set():
+            self._peak = max(self._peak, current_rss_mb())
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        gc.collect()
+        self._before = current_rss_mb()
+        self._peak = self._before
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sample, name='rss-sampler', daemon=True)
+        self._thread.start()
+        self._started_tracing = self.trace and not tracemalloc.is_tracing()
+        if self._started_tracing:
+            tracemalloc.start()
+        if self.trace:
+            tracemalloc.reset_peak()
+        return self
+
+    def __exit__(self, *exc):
+        traced_peak = None
+        if self.trace:
+            traced_peak = tracemalloc.get_traced_memory()[1] / MB
+            if self._started_tracing:
+                tracemalloc.stop()
+        self._stop.set()
+        self._thread.join()
+        after = current_rss_mb()
+        peak = max(self._peak, after)
+        self.result = {
+            'rss_before': self._before,
+            'rss_peak': peak,
+            'rss_after': after,
+            'rss_extra': peak - self._before,
+            'traced_peak': traced_peak,
+        }
+        return False
+
+
+def settle_rss(duration=0.2):
+    """RSS once allocator caches had a moment to settle (steady state)"""
+    gc.collect()
+    time.sleep(duration)
+    return current_rss_mb()
+
+
+def profile_engine_memory(engine, images):
+    """Memory profile of an already loaded engine.
+
+    images: {label: RGB array}, e.g. one page per size. For each image the
+    extra RSS (over the steady state) and traced peak allocation of one
+    inference are recorded, after one untraced warm-up run so lazily
+    allocated buffers are not counted as per-inference cost.
+    """
+    profile = {'steady_rss_mb': settle_rss(), 'per_inference': {}}
+    for label, image in images.items():
+        engine.recognize(image)
+        with MemoryProbe() as probe:
+            engine.recognize(image)
+        r = probe.result
+        profile['per_inference'][label] = {
+            'pixels': int(image.shape[0] * image.shape[1]),
+            'rss_extra_mb': r['rss_extra'],
+            'traced_peak_mb': r['traced_peak'],
+            'retained_mb': r['rss_after'] - r['rss_before'],
+        }
+    profile['steady_rss_after_mb'] = settle_rss()
+    return profile
@@ -0,0 +1,170 @@
+import threading
+import time
+
+import cv2
+
+DEFAULT_MAX_SIDE = 1280   # frames are downsized to this before upload
+DEFAULT_JPEG_QUALITY = 85
+
+
+class LanguageMismatchError(RuntimeError):
+    """The server's reader was loaded with other languages than the local one"""
+
+
+def downscale(image, max_side):
+    """Shrink image so its longest side is at most max_side, return (image, scale)"""
+    h, w = image.shape[:2]
+    scale = min(1.0, max_side / float(max(h, w)))
+    if scale < 1.0:
+        image = cv2.resize(image, (int(w * scale), int(h * scale)), interpolation=cv2.INTER_AREA)
+    return image, scale
+
+
+class RemoteOCRClient:
+    """Sends frames to Serveur_Python/server.py over a pooled keep-alive session.
+
+    langs are sent with every request; the server refuses the request
+    (LanguageMismatchError) unless its reader has exactly these languages,
+    so remote results are interchangeable with the local reader's.
+    timeout is (connect, read): an unreachable host fails within a second.
+    """
+
+    def __init__(self, base_url, langs, timeout=(1.0, 10.0), max_side=DEFAULT_MAX_SIDE, jpeg_quality=DEFAULT_JPEG_QUALITY):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.url = base_url.rstrip('/') + '/ocr'
+        self.langs = list(langs)
+        self.timeout = timeout
+        self.max_side = max_side
+        self.jpeg_quality = jpeg_quality
+
+        # One persistent connection is enough: captures are sequential
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=2, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def readtext(self, image):
+        """Same output as easyocr's readtext(detail=1), in original pixel coordinates"""
+        small, scale = downscale(image, self.max_side)
+        if small.ndim == 3:
+            # App passes RGB frames, imencode expects BGR
+            small = cv2.cvtColor(small, cv2.COLOR_RGB2BGR)
+        ok, buf = cv2.imencode('.jpg', small, [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality])
+        if not ok:
+            raise RuntimeError("Cannot encode frame")
+
+        response = self.session.post(
+            self.url,
+            files={'image': ('frame.jpg', buf.tobytes(), 'image/jpeg')},
+            data={'detail': '1', 'langs': ','.join(self.langs)},
+            timeout=self.timeout
+        )
+        if response.status_code == 409:
+            raise LanguageMismatchError(response.json().get('text', 'Server OCR languages differ'))
+        response.raise_for_status()
+        payload = response.json()
+        if 'results' not in payload:
+            # server.py reports failures as 200 + {'text': 'Error: ...'}
+            raise RuntimeError(payload.get('text', 'Invalid server response'))
+
+        return [
+            ([[x / scale, y / scale] for (x, y) in bbox], text, conf)
+            for (bbox, text, conf) in payload['results']
+        ]
+
+    def close(self):
+        self.session.close()
+
+
+class HybridOCRScheduler:
+    """Routes each OCR call to the local reader or the remote server.
+
+    Latency of both paths is tracked as an exponential moving average and
+    each call goes to whichever is currently faster. Every probe_every calls
+    the slower path is used once so its estimate does not go stale. A remote
+    failure falls back to local and disables the remote path for
+    failure_cooldown seconds, doubled after each consecutive failure up to
+    max_cooldown and reset by a success; a server with other languages is
+    never used.
+    """
+
+    def __init__(self, local_reader, remote=None, alpha=0.3, probe_every=10, failure_cooldown=30.0,
+                 max_cooldown=600.0):
+        self.local_reader = local_reader
+        self.remote = remote
+        self.alpha = alpha
+        self.probe_every = probe_every
+        self.failure_cooldown = failure_cooldown
+        self.max_cooldown = max_cooldown
+
+        self._lock = threading.Lock()
+        self._latency = {'local': None, 'remote': None}
+        self._calls = 0
+        self._remote_failures = 0
+        self._remote_disabled_until = 0.0
+
+    def readtext(self, image):
+        """Run OCR on image (easyocr detail=1 format)"""
+        if self._choose() == 'remote':
+            start = time.perf_counter()
+            try:
+                results = self.remote.readtext(image)
+                self._record('remote', time.perf_counter() - start)
+                with self._lock:
+                    self._remote_failures = 0
+                return results
+            except LanguageMismatchError as e:
+                print(f"Remote OCR disabled: {e}")
+                with self._lock:
+                    self._remote_failures += 1
+                    self._remote_disabled_until = float('inf')
+            except Exception as e:
+                print(f"Remote OCR failed, using local: {e}")
+                with self._lock:
+                    self._remote_failures += 1
+                    cooldown = min(self.max_cooldown, self.failure_cooldown * 2 ** (self._remote_failures - 1))
+                    self._remote_disabled_until = time.monotonic() + cooldown
+
+        start = time.perf_counter()
+        results = self.local_reader.readtext(image, detail=1)
+        self._record('local', time.perf_counter() - start)
+        return results
+
+    def stats(self):
+        """Current latency estimates and routing state"""
+        with self._lock:
+            return {
+                'local_latency': self._latency['local'],
+                'remote_latency': self._latency['remote'],
+                'calls': self._calls,
+                'remote_failures': self._remote_failures,
+                'remote_available': self.remote is not None and time.monotonic() >= self._remote_disabled_until,
+            }
+
+    def _choose(self):
+        with self._lock:
+            self._calls += 1
+            if self.remote is None or time.monotonic() < self._remote_disabled_until:
+                return 'local'
+
+            local, remote = self._latency['local'], self._latency['remote']
+            # Measure each path at least once before comparing
+            if remote is None:
+                return 'remote'
+            if local is None:
+                return 'local'
+
+            faster, slower = ('remote', 'local') if remote <= local else ('local', 'remote')
+            if self.probe_every and self._calls % self.probe_every == 0:
+                return slower
+            return faster
+
+    def _record(self, path, elapsed):
+        with self._lock:
+            previous = self._latency[path]
+            if previous is None:
+                self._latency[path] = elapsed
+            else:
+                self._latency[path] = self.alpha * elapsed + (1 - self.alpha) * previous
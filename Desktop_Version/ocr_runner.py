@@ -0,0 +1,127 @@
+import multiprocessing
+import sys
+import time
+import traceback
+
+from resource_governor import ResourceGovernor, available_cores
+
+# 'spawn' gives every engine a fresh interpreter: no model memory, thread
+# pools or allocator state is inherited from the parent or another engine
+_CONTEXT = multiprocessing.get_context('spawn')
+
+
+def _apply_torch(governor):
+    # Only engines that loaded torch have a pool to size; importing it
+    # for the others would add its memory to their footprint
+    if 'torch' in sys.modules:
+        governor.apply_torch()
+
+
+def _engine_worker(name, corpus_dir, warmup, repeats, memory_sizes, cores, conn):
+    """Child process: pin to its cores, size thread pools, benchmark one engine.
+
+    The parent's main script (ocr_bench.py) has already been re-imported
+    here; it keeps numpy and cv2 out of module level so that the thread
+    settings below are in place before they load.
+    """
+    try:
+        governor = ResourceGovernor(pin_cores=True, cores=cores)
+        # Before any engine import so torch/OpenMP/BLAS pick the budget up
+        governor.apply_env()
+        governor.pin()
+        # EasyOCR leans on OpenCV for pre/post-processing
+        governor.apply_opencv()
+
+        from bench_common import environment
+        from ocr_bench import benchmark_engine
+        from ocr_corpus import load_corpus
+        result = benchmark_engine(name, load_corpus(corpus_dir), warmup, repeats, memory_sizes,
+                                  after_load=lambda: _apply_torch(governor))
+        result['isolation'] = governor.effective()
+        result['environment'] = environment()
+        conn.send(result)
+    except BaseException:
+        conn.send({'engine': name, 'error': traceback.format_exc(limit=5)})
+    finally:
+        conn.close()
+
+
+def _start(name, corpus_dir, warmup, repeats, memory_sizes, cores):
+    parent, child = _CONTEXT.Pipe(duplex=False)
+    process = _CONTEXT.Process(
+        target=_engine_worker,
+        args=(name, corpus_dir, warmup, repeats, memory_sizes, cores, child),
+        name=f'ocr-bench-{name}',
+        daemon=True
+    )
+    process.start()
+    child.close()
+    return process, parent
+
+
+def _collect(name, process, conn, deadline):
+    """Wait for one worker's result, killing it if it overruns the deadline"""
+    remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+    if conn.poll(remaining):
+        try:
+            result = conn.recv()
+        except EOFError:
+            result = {'engine': name, 'error': f'worker exited with code {process.exitcode}'}
+    else:
+        process.kill()
+        result = {'engine': name, 'error': 'timeout'}
+    process.join()
+    return result
+
+
+def split_cores(cores, parts):
+    """Split cores into `parts` disjoint, near-equal groups (at least one core each)"""
+    if parts > len(cores):
+        # Not enough cores: engines have to share them round-robin
+        return [[cores[i % len(cores)]] for i in range(parts)]
+    size, extra = divmod(len(cores), parts)
+    groups, start = [], 0
+    for i in range(parts):
+        end = start + size + (1 if i < extra else 0)
+        groups.append(cores[start:end])
+        start = end
+    return groups
+
+
+def run_isolated(corpus_dir, engines, warmup=2, repeats=3, mode='sequential',
+                 cpu_budget=None, timeout=None, memory_sizes=(640, 1280, 1920)):
+    """Benchmark each engine in its own process.
+
+    mode='sequential': one engine at a time, each with the whole CPU budget.
+    mode='concurrent': all engines at once, each pinned to its own disjoint
+    share of the budget. Faster overall; per-engine numbers then reflect
+    the smaller core count, which the result records.
+    Returns {engine name: result dict} (same shape as benchmark_engine).
+    """
+    cores = available_cores()
+    if cpu_budget:
+        cores = cores[:cpu_budget]
+
+    results = {}
+    if mode == 'concurrent':
+        groups = split_cores(cores, len(engines))
+        deadline = time.monotonic() + timeout if timeout else None
+        workers = {
+            name: _start(name, corpus_dir, warmup, repeats, memory_sizes, group)
+            for name, group in zip(engines, groups)
+        }
+        for name, (process, conn) in workers.items():
+            results[name] = _collect(name, process, conn, deadline)
+    elif mode == 'sequential':
+        for name in engines:
+            print(f"▶ {name} (isolated process)...", flush=True)
+            deadline = time.monotonic() + timeout if timeout else None
+            process, conn = _start(name, corpus_dir, warmup, repeats, memory_sizes, cores)
+            results[name] = _collect(name, process, conn, deadline)
+    else:
+        raise ValueError(f"Unknown isolation mode '{mode}'")
+
+    for name, result in results.items():
+        if 'error' in result:
+            print(f"❌ {name}: {result['error']}")
+    return results
@@ -0,0 +1,268 @@
+import time
+
+import cv2
+import numpy as np
+
+# Stages always run in this order; each takes and returns a grayscale image
+STAGE_ORDER = ('resize', 'deskew', 'denoise', 'sharpen', 'clahe', 'binarize')
+
+DEFAULT_CONFIG = {
+    # Stages the metric-based selection may pick from
+    'enabled': STAGE_ORDER,
+    # Stages forced on for every frame, regardless of metrics
+    'forced': (),
+
+    # Metrics are computed on a copy downscaled to this size (cheap)
+    'metrics_max_side': 640,
+
+    # Selection thresholds
+    'min_contrast': 45.0,        # gray std below this -> clahe
+    'min_sharpness': 120.0,      # Laplacian variance below this -> sharpen
+    'max_noise': 6.0,            # estimated noise sigma above this -> denoise
+    'min_skew': 1.5,             # degrees of skew above this -> deskew
+    'max_unevenness': 35.0,      # background illumination spread -> binarize
+    'min_side': 480,             # upscale frames smaller than this
+    'max_side': 2400,            # downscale frames larger than this
+
+    # Stage parameters
+    'clahe_clip': 2.0,
+    'clahe_tile': 8,
+    'denoise_ksize': 3,
+    'sharpen_amount': 1.0,
+    'binarize_block': 11,
+    'binarize_c': 2,
+}
+
+
+def _small_gray(gray, max_side):
+    h, w = gray.shape[:2]
+    scale = min(1.0, max_side / float(max(h, w)))
+    if scale < 1.0:
+        gray = cv2.resize(gray, (int(w * scale), int(h * scale)), interpolation=cv2.INTER_AREA)
+    return gray
+
+
+def estimate_noise(gray):
+    """Noise sigma estimate (Immerkaer's fast method)"""
+    kernel = np.array([[1, -2, 1], [-2, 4, -2], [1, -2, 1]], dtype=np.float32)
+    response = cv2.filter2D(gray.astype(np.float32), -1, kernel)
+    h, w = gray.shape[:2]
+    return float(np.abs(response[1:-1, 1:-1]).sum() * np.sqrt(np.pi / 2) / (6.0 * (w - 2) * (h - 2)))
+
+
+def estimate_skew(gray):
+    """Dominant text line angle in degrees (0 when no lines are found)"""
+    _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+    # Merge characters into line blobs, then take the median blob angle
+    kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (25, 3))
+    lines = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, kernel)
+    contours, _ = cv2.findContours(lines, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+
+    angles = []
+    for contour in contours:
+        (_, _), (w, h), angle = cv2.minAreaRect(contour)
+        if min(w, h) < 4 or max(w, h) < 4 * min(w, h):
+            continue  # not line shaped
+        if w < h:
+            angle -= 90
+        # minAreaRect conventions differ between OpenCV versions
+        while angle <= -45:
+            angle += 90
+        while angle > 45:
+            angle -= 90
+        angles.append(angle)
+    return float(np.median(angles)) if angles else 0.0
+
+
+def measure_quality(gray, max_side=640):
+    """Cheap image-quality metrics used to pick preprocessing stages"""
+    small = _small_gray(gray, max_side)
+    # Downscaling averages noise away, so estimate it on a full-resolution crop
+    h, w = gray.shape[:2]
+    top, left = max(0, (h - max_side) // 2), max(0, (w - max_side) // 2)
+    crop = gray[top:top + max_side, left:left + max_side]
+    # Background illumination: spread of a very coarse version of the frame
+    coarse = cv2.resize(small, (16, 16), interpolation=cv2.INTER_AREA)
+    return {
+        'height': int(gray.shape[0]),
+        'width': int(gray.shape[1]),
+        'brightness': float(small.mean()),
+        'contrast': float(small.std()),
+        'sharpness': float(cv2.Laplacian(small, cv2.CV_64F).var()),
+        'noise': estimate_noise(crop),
+        'skew': estimate_skew(small),
+        'unevenness': float(coarse.std()),
+    }
+
+
+def select_stages(metrics, config):
+    """Names of the stages this frame needs, in STAGE_ORDER"""
+    wanted = set(config['forced'])
+    if min(metrics['height'], metrics['width']) < config['min_side'] or \
+            max(metrics['height'], metrics['width']) > config['max_side']:
+        wanted.add('resize')
+    if abs(metrics['skew']) > config['min_skew']:
+        wanted.add('deskew')
+    if metrics['noise'] > config['max_noise']:
+        wanted.add('denoise')
+    elif metrics['sharpness'] < config['min_sharpness']:
+        # Sharpening a noisy frame only amplifies the noise
+        wanted.add('sharpen')
+    if metrics['contrast'] < config['min_contrast']:
+        wanted.add('clahe')
+    if metrics['unevenness'] > config['max_unevenness'] or 'clahe' in wanted:
+        wanted.add('binarize')
+
+    enabled = set(config['enabled']) | set(config['forced'])
+    return [name for name in STAGE_ORDER if name in wanted and name in enabled]
+
+
+# ----------------------------------------------------------------------
+# Stages
+# ----------------------------------------------------------------------
+
+def _resize_scale(gray, config):
+    h, w = gray.shape[:2]
+    if min(h, w) < config['min_side']:
+        return min(2.0, config['min_side'] / float(min(h, w)))
+    if max(h, w) > config['max_side']:
+        return config['max_side'] / float(max(h, w))
+    return 1.0
+
+
+def stage_resize(gray, metrics, config):
+    scale = _resize_scale(gray, config)
+    if scale == 1.0:
+        return gray
+    interpolation = cv2.INTER_CUBIC if scale > 1.0 else cv2.INTER_AREA
+    return cv2.resize(gray, None, fx=scale, fy=scale, interpolation=interpolation)
+
+
+def _deskew_matrix(gray, metrics):
+    h, w = gray.shape[:2]
+    return cv2.getRotationMatrix2D((w / 2.0, h / 2.0), metrics['skew'], 1.0)
+
+
+def stage_deskew(gray, metrics, config):
+    h, w = gray.shape[:2]
+    return cv2.warpAffine(gray, _deskew_matrix(gray, metrics), (w, h),
+                          flags=cv2.INTER_LINEAR, borderMode=cv2.BORDER_REPLICATE)
+
+
+def stage_denoise(gray, metrics, config):
+    return cv2.medianBlur(gray, config['denoise_ksize'])
+
+
+def stage_sharpen(gray, metrics, config):
+    # Unsharp mask
+    blurred = cv2.GaussianBlur(gray, (0, 0), 2.0)
+    amount = config['sharpen_amount']
+    return cv2.addWeighted(gray, 1.0 + amount, blurred, -amount, 0)
+
+
+def stage_clahe(gray, metrics, config):
+    tile = config['clahe_tile']
+    clahe = cv2.createCLAHE(clipLimit=config['clahe_clip'], tileGridSize=(tile, tile))
+    return clahe.apply(gray)
+
+
+def stage_binarize(gray, metrics, config):
+    return cv2.adaptiveThreshold(
+        gray, 255,
+        cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+        cv2.THRESH_BINARY,
+        config['binarize_block'], config['binarize_c']
+    )
+
+
+STAGES = {
+    'resize': stage_resize,
+    'deskew': stage_deskew,
+    'denoise': stage_denoise,
+    'sharpen': stage_sharpen,
+    'clahe': stage_clahe,
+    'binarize': stage_binarize,
+}
+
+def transform_resize(gray, metrics, config):
+    scale = _resize_scale(gray, config)
+    return np.float64([[scale, 0, 0], [0, scale, 0]])
+
+
+def transform_deskew(gray, metrics, config):
+    return _deskew_matrix(gray, metrics)
+
+
+# Stages that move pixels: 2x3 affine matrix from their input to their output
+TRANSFORMS = {
+    'resize': transform_resize,
+    'deskew': transform_deskew,
+}
+
+
+def _affine3(matrix):
+    return np.vstack([matrix, [0.0, 0.0, 1.0]])
+
+
+def map_to_original(results, transform):
+    """Move easyocr detail=1 boxes found on a processed image back to frame coordinates.
+
+    transform is the 3x3 matrix returned by Preprocessor.process; None or
+    identity leaves the results unchanged.
+    """
+    if transform is None or np.allclose(transform, np.eye(3)):
+        return results
+    inverse = np.linalg.inv(transform)
+    mapped = []
+    for bbox, text, conf in results:
+        points = np.hstack([np.asarray(bbox, dtype=np.float64), np.ones((len(bbox), 1))]) @ inverse.T
+        mapped.append(([[float(x), float(y)] for x, y, _ in points], text, conf))
+    return mapped
+
+
+class Preprocessor:
+    """Runs the stages a frame needs and records how long each one took"""
+
+    def __init__(self, config=None):
+        self.config = dict(DEFAULT_CONFIG)
+        if config:
+            self.config.update(config)
+
+    def process(self, frame, stages=None):
+        """Preprocess a BGR or grayscale frame.
+
+        stages overrides the metric-based selection. Returns a dict with the
+        processed 'image' (None when no stage was needed), 'stages',
+        'metrics', per-step 'timings' in seconds and 'transform', the 3x3
+        matrix from frame to processed pixel coordinates (resize, deskew);
+        map_to_original() uses it to bring OCR boxes back to the frame.
+        """
+        timings = {}
+
+        start = time.perf_counter()
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+        timings['gray'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        metrics = measure_quality(gray, self.config['metrics_max_side'])
+        timings['metrics'] = time.perf_counter() - start
+
+        if stages is None:
+            stages = select_stages(metrics, self.config)
+
+        image = gray
+        transform = np.eye(3)
+        for name in stages:
+            start = time.perf_counter()
+            if name in TRANSFORMS:
+                transform = _affine3(TRANSFORMS[name](image, metrics, self.config)) @ transform
+            image = STAGES[name](image, metrics, self.config)
+            timings[name] = time.perf_counter() - start
+
+        return {
+            'image': image if stages else None,
+            'stages': list(stages),
+            'metrics': metrics,
+            'timings': timings,
+            'transform': transform,
+        }
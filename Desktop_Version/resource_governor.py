@@ -0,0 +1,133 @@
+"""Single CPU budget shared by torch, OpenCV and our own worker threads.
+
+Used by both App.py and Serveur_Python/server.py. Configure with:
+    VISIONSPEAK_CPU_BUDGET   cores the process may use (default: all available)
+    VISIONSPEAK_OCR_WORKERS  concurrent OCR jobs (default: 1)
+    VISIONSPEAK_PIN_CORES    1 to pin the process to the first <budget> cores
+"""
+import os
+import sys
+
+# Thread pools of the BLAS/OpenMP runtimes torch and numpy may load
+THREAD_ENV_VARS = ('OMP_NUM_THREADS', 'MKL_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'NUMEXPR_NUM_THREADS')
+
+
+def available_cores():
+    """Cores this process is currently allowed to run on"""
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    try:
+        import psutil
+        return sorted(psutil.Process().cpu_affinity())
+    except Exception:
+        return list(range(os.cpu_count() or 1))
+
+
+class ResourceGovernor:
+    """Splits a CPU budget between the libraries that bring their own thread pools.
+
+    reserve cores are left for the UI and audio threads (the desktop app
+    uses 1, the server 0). What remains is divided between ocr_workers
+    concurrent OCR jobs, each getting its own torch intra-op threads.
+    Speech synthesis processes (tts_workers) share the budget with torch:
+    text is read back once OCR has finished, when torch is idle.
+    Inter-op parallelism is kept at 1: EasyOCR runs one graph at a time,
+    and a second pool only competes with the intra-op threads.
+    """
+
+    def __init__(self, cpu_budget=None, reserve=0, ocr_workers=1, pin_cores=False, cores=None):
+        cores = list(cores) if cores else available_cores()
+        self.cpu_budget = max(1, min(cpu_budget or len(cores), len(cores)))
+        self.reserve = min(reserve, self.cpu_budget - 1)
+        self.pin_cores = pin_cores
+        self.cores = cores[:self.cpu_budget]
+
+        compute = self.cpu_budget - self.reserve
+        ocr_workers = max(1, min(ocr_workers, compute))
+        self.plan = {
+            'cpu_budget': self.cpu_budget,
+            'reserve': self.reserve,
+            'ocr_workers': ocr_workers,
+            'torch_intra_op': max(1, compute // ocr_workers),
+            'torch_inter_op': 1,
+            # One core stays for playback and the UI
+            'tts_workers': max(1, min(4, self.cpu_budget - 1)),
+            # OpenCV work (preview, preprocessing) is small next to inference
+            'opencv_threads': 1 if self.cpu_budget <= 4 else 2,
+        }
+        self._applied = {}
+
+    @classmethod
+    def from_env(cls, reserve=0):
+        budget = os.environ.get('VISIONSPEAK_CPU_BUDGET')
+        workers = os.environ.get('VISIONSPEAK_OCR_WORKERS')
+        return cls(
+            cpu_budget=int(budget) if budget else None,
+            reserve=reserve,
+            ocr_workers=int(workers) if workers else 1,
+            pin_cores=os.environ.get('VISIONSPEAK_PIN_CORES') == '1'
+        )
+
+    def apply_env(self):
+        """Set OpenMP/BLAS thread counts; must run before torch is imported"""
+        if 'torch' in sys.modules:
+            print("Resource governor: torch already imported, thread env vars may be ignored")
+        for name in THREAD_ENV_VARS:
+            os.environ[name] = str(self.plan['torch_intra_op'])
+        self._applied['env'] = True
+
+    def pin(self):
+        """Restrict to the budgeted cores (if pin_cores is set).
+
+        Call from the main thread before starting workers: on Linux the
+        affinity applies to the calling thread and is inherited by new ones.
+        """
+        if not self.pin_cores:
+            return
+        try:
+            if hasattr(os, 'sched_setaffinity'):
+                os.sched_setaffinity(0, self.cores)
+            else:
+                import psutil
+                psutil.Process().cpu_affinity(self.cores)
+            self._applied['pinned'] = list(self.cores)
+        except Exception as e:
+            print(f"Resource governor: cannot pin cores: {e}")
+
+    def apply_torch(self):
+        import torch
+        torch.set_num_threads(self.plan['torch_intra_op'])
+        try:
+            torch.set_num_interop_threads(self.plan['torch_inter_op'])
+        except RuntimeError:
+            # Only allowed before the first parallel op; keep whatever is set
+            pass
+        self._applied['torch'] = True
+
+    def apply_opencv(self):
+        import cv2
+        cv2.setNumThreads(self.plan['opencv_threads'])
+        self._applied['opencv'] = True
+
+    def effective(self):
+        """Settings as the libraries actually report them"""
+        settings = {'plan': dict(self.plan), 'applied': dict(self._applied), 'affinity': available_cores()}
+        settings['env'] = {name: os.environ.get(name) for name in THREAD_ENV_VARS}
+        if 'torch' in sys.modules:
+            import torch
+            settings['torch_intra_op'] = torch.get_num_threads()
+            settings['torch_inter_op'] = torch.get_num_interop_threads()
+        if 'cv2' in sys.modules:
+            import cv2
+            settings['opencv_threads'] = cv2.getNumThreads()
+        return settings
+
+    def report(self):
+        eff = self.effective()
+        lines = ["=== RESOURCE GOVERNOR ==="]
+        for key, value in self.plan.items():
+            lines.append(f"{key:<16} planned={value!s:<6} effective={eff.get(key, '-')}")
+        lines.append(f"{'affinity':<16} {eff['affinity']}")
+        lines.append(f"{'applied':<16} {eff['applied']}")
+        lines.append(f"{'thread env':<16} {eff['env']}")
+        return '\n'.join(lines)
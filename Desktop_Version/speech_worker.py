@@ -0,0 +1,235 @@
+import itertools
+import queue
+import threading
+import time
+
+from tts_cache import TTSCache, cache_key
+
+# Lower value = spoken first
+PRIORITY_HIGH = 0    # status prompts and errors
+PRIORITY_NORMAL = 1  # recognized text
+
+CACHE_MAX_CHARS = 200  # short texts (labels, signs) are kept in the audio cache, longer ones are segmented
+
+_SHUTDOWN = object()
+
+
+class SpeechWorker:
+    """Owns the pyttsx3 engine on a dedicated thread.
+
+    pyttsx3 is not thread-safe and runAndWait() blocks, so callers only
+    enqueue utterances here and never touch the engine themselves. Fixed
+    prompts are rendered into the shared audio cache at startup, and short
+    texts are rendered there before being played; cached audio is played back
+    through Kivy's audio loader, which avoids synthesis latency entirely.
+    Longer texts go to the optional LongTextSynthesizer and are played
+    sentence by sentence while the following sentences are synthesized;
+    the worker owns it and closes it on shutdown.
+    """
+
+    def __init__(self, rate=150, volume=1.0, prompts=(), cache=None, long_text=None):
+        self.rate = rate
+        self.volume = volume
+        self.prompts = tuple(prompts)
+        self.cache = cache if cache is not None else TTSCache()
+        self.long_text = long_text
+        self.ready = threading.Event()
+        self.error = None
+
+        self._queue = queue.PriorityQueue()
+        self._counter = itertools.count()
+        self._generation = 0
+        self._speaking_generation = 0
+        self._engine = None
+        self._sounds = {}
+        self._sound_loader = None
+        self._voice = None
+        self._current_sound = None
+        self._thread = None
+
+    def start(self):
+        """Start the worker thread (returns immediately)"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='speech-worker', daemon=True)
+            self._thread.start()
+        return self
+
+    def say(self, text, priority=PRIORITY_NORMAL, interrupt=False):
+        """Queue text for speech; interrupt=True drops everything pending first"""
+        if not text:
+            return
+        if interrupt:
+            self.cancel()
+        self._queue.put((priority, next(self._counter), self._generation, text))
+
+    def cancel(self):
+        """Stop the current utterance and discard the queue"""
+        # Bumping the generation invalidates every queued item and makes the
+        # engine callback stop the utterance in progress on its own thread.
+        self._generation += 1
+        sound = self._current_sound
+        if sound is not None:
+            try:
+                sound.stop()
+            except Exception:
+                pass
+
+    def shutdown(self, timeout=2.0):
+        """Cancel speech and stop the worker thread"""
+        self.cancel()
+        self._queue.put((-1, next(self._counter), self._generation, _SHUTDOWN))
+        if self._thread is not None:
+            self._thread.join(timeout)
+        if self.long_text is not None:
+            self.long_text.close()
+
+    # ------------------------------------------------------------------
+    # Worker thread
+    # ------------------------------------------------------------------
+
+    def _run(self):
+        try:
+            import pyttsx3
+            self._engine = pyttsx3.init()
+            self._engine.setProperty('rate', self.rate)
+            self._engine.setProperty('volume', self.volume)
+            self._engine.connect('started-word', self._on_word)
+            self._voice = self._engine.getProperty('voice')
+            if self.long_text is not None and self.long_text.voice is None:
+                self.long_text.voice = self._voice
+            self._prerender()
+        except Exception as e:
+            self.error = e
+            print(f"TTS Error: {e}")
+        finally:
+            self.ready.set()
+
+        while True:
+            _, _, generation, text = self._queue.get()
+            if text is _SHUTDOWN:
+                break
+            if generation != self._generation or self._engine is None:
+                continue
+            self._speaking_generation = generation
+            try:
+                if len(text) > CACHE_MAX_CHARS and self.long_text is not None and self._sound_loader:
+                    self._speak_long(text, generation)
+                elif not self._play_cached(text, generation):
+                    if len(text) <= CACHE_MAX_CHARS and self._sound_loader:
+                        # Synthesize once, into the cache, and play the file:
+                        # next time this text plays instantly
+                        self._render([text])
+                        if generation != self._generation or self._play_cached(text, generation):
+                            continue
+                    self._engine.say(text)
+                    self._engine.runAndWait()
+            except Exception as e:
+                print(f"TTS Error: {e}")
+
+        if self._engine is not None:
+            try:
+                self._engine.stop()
+            except Exception:
+                pass
+
+    def _on_word(self, name, location, length):
+        # Runs inside runAndWait(), so stopping here is safe for every driver
+        if self._speaking_generation != self._generation:
+            self._engine.stop()
+
+    def _cache_key(self, text):
+        # Rendered at full volume; the volume is applied at playback
+        return cache_key('pyttsx3', self._voice, self.rate, None, text)
+
+    def _render(self, texts):
+        """Synthesize texts into the audio cache (worker thread only)"""
+        missing = [t for t in texts if self.cache.get(self._cache_key(t)) is None]
+        if not missing:
+            return
+        self._engine.setProperty('volume', 1.0)
+        try:
+            for text in missing:
+                self.cache.get_or_create(self._cache_key(text), '.wav', lambda tmp, text=text: self._save(text, tmp))
+        except InterruptedError:
+            pass  # cancel() stopped the engine; nothing truncated is cached
+        finally:
+            self._engine.setProperty('volume', self.volume)
+
+    def _save(self, text, path):
+        self._engine.save_to_file(text, path)
+        self._engine.runAndWait()
+        if self._speaking_generation != self._generation:
+            raise InterruptedError
+
+    def _load_sound(self, text):
+        if self._sound_loader is None:
+            return None
+        path = self.cache.get(self._cache_key(text))
+        if path is None:
+            return None
+        sound = self._sound_loader.load(str(path))
+        if sound is not None:
+            sound.volume = self.volume
+        return sound
+
+    def _prerender(self):
+        """Make sure the fixed prompts are cached and preload them"""
+        try:
+            from kivy.core.audio import SoundLoader
+            self._sound_loader = SoundLoader
+        except ImportError:
+            pass
+        if not self.prompts:
+            return
+        self._render(self.prompts)
+        for prompt in self.prompts:
+            sound = self._load_sound(prompt)
+            if sound is not None:
+                self._sounds[prompt] = sound
+
+    def _play_cached(self, text, generation):
+        sound = self._sounds.get(text)
+        transient = sound is None
+        if transient and len(text) <= CACHE_MAX_CHARS:
+            sound = self._load_sound(text)
+        if sound is None:
+            return False
+        try:
+            self._play(sound, generation)
+        finally:
+            if transient:
+                sound.unload()
+        return True
+
+    def _speak_long(self, text, generation):
+        """Play a long text sentence by sentence while the pool synthesizes ahead"""
+        segments = self.long_text.synthesize(text)
+        try:
+            for _, _, path in segments:
+                if generation != self._generation:
+                    break
+                sound = self._sound_loader.load(path)
+                if sound is None:
+                    continue
+                sound.volume = self.volume
+                try:
+                    self._play(sound, generation)
+                finally:
+                    sound.unload()
+        finally:
+            # Cancels the sentences not yet synthesized
+            segments.close()
+
+    def _play(self, sound, generation):
+        """Play a loaded sound to the end or until cancel()"""
+        self._current_sound = sound
+        try:
+            sound.play()
+            # Give the backend a moment to switch state before polling it
+            time.sleep(0.05)
+            while sound.state == 'play' and generation == self._generation:
+                time.sleep(0.02)
+            if sound.state == 'play':
+                sound.stop()
+        finally:
+            self._current_sound = None
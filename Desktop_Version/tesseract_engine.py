@@ -0,0 +1,97 @@
+import os
+import queue
+from contextlib import contextmanager
+
+import numpy as np
+
+DEFAULT_TESSDATA = r'C:\Program Files\Tesseract-OCR\tessdata'
+
+
+def tessdata_path():
+    """TESSDATA_PREFIX if set, else the default Windows install location"""
+    path = os.environ.get('TESSDATA_PREFIX')
+    if path:
+        return path
+    return DEFAULT_TESSDATA if os.path.isdir(DEFAULT_TESSDATA) else None
+
+
+class TesseractPool:
+    """Initialized Tesseract engines kept alive in-process (via tesserocr).
+
+    pytesseract starts the tesseract executable, writes the image to a temp
+    file and reloads the traineddata on every call. Here each API instance
+    loads its models once and receives pixel buffers directly. One instance
+    serves one call at a time; tesserocr releases the GIL while recognizing,
+    so size > 1 lets several threads run OCR in parallel.
+    """
+
+    def __init__(self, lang='eng+fra+ara', size=1, tessdata=None, psm=None):
+        try:
+            import tesserocr
+        except ImportError:
+            raise ImportError("tesserocr non installé. Installation : pip install tesserocr")
+        self.tesserocr = tesserocr
+
+        path = tessdata or tessdata_path()
+        _, installed = tesserocr.get_languages(path) if path else tesserocr.get_languages()
+        requested = lang.split('+')
+        missing = [l for l in requested if l not in installed]
+        if missing:
+            print(f"⚠️  Données Tesseract absentes : {', '.join(missing)}")
+            requested = [l for l in requested if l in installed]
+        self.lang = '+'.join(requested)
+
+        self._apis = queue.Queue()
+        self._all = []
+        options = {'lang': self.lang, 'psm': tesserocr.PSM.AUTO if psm is None else psm}
+        if path:
+            options['path'] = path
+        for _ in range(max(1, size)):
+            api = tesserocr.PyTessBaseAPI(**options)
+            self._all.append(api)
+            self._apis.put(api)
+
+    @contextmanager
+    def acquire(self):
+        api = self._apis.get()
+        try:
+            yield api
+        finally:
+            api.Clear()
+            self._apis.put(api)
+
+    def recognize(self, image, details=True):
+        """OCR an RGB or grayscale numpy array.
+
+        Returns {'text', 'lines', 'words'}; lines and words are lists of
+        (text, confidence 0-100, (x1, y1, x2, y2)) when details is True.
+        """
+        image = np.ascontiguousarray(image)
+        height, width = image.shape[:2]
+        channels = 1 if image.ndim == 2 else image.shape[2]
+
+        with self.acquire() as api:
+            api.SetImageBytes(image.tobytes(), width, height, channels, width * channels)
+            api.Recognize()
+            result = {'text': api.GetUTF8Text().strip(), 'lines': [], 'words': []}
+            if details:
+                ril = self.tesserocr.RIL
+                result['lines'] = self._collect(api, ril.TEXTLINE)
+                result['words'] = self._collect(api, ril.WORD)
+        return result
+
+    def _collect(self, api, level):
+        items = []
+        iterator = api.GetIterator()
+        if iterator is None:
+            return items
+        for r in self.tesserocr.iterate_level(iterator, level):
+            text = r.GetUTF8Text(level)
+            if text and text.strip():
+                items.append((text.strip(), r.Confidence(level), r.BoundingBox(level)))
+        return items
+
+    def close(self):
+        for api in self._all:
+            api.End()
+        self._all = []
@@ -0,0 +1,435 @@
+"""TTS benchmark: time to first audio, total synthesis time and real-time factor.
+
+    python tts_bench.py --output tts_results.json
+    python tts_bench.py --engines gtts edge-tts --languages fr ar --repeats 10
+    python tts_bench.py --online          # real Google / Microsoft services
+
+gTTS and edge-tts need the internet. Unless --online is given they are
+pointed at local stand-in servers speaking the same protocols (Google
+batchexecute over HTTP, the Edge read-aloud WebSocket) that return silent
+MP3 after a configurable first-byte latency and synthesis speed. Absolute
+numbers are then those of the simulated service; what is measured for
+real is the client side: request splitting, streaming and decoding, which
+is what differs between engines and between versions of our code.
+pyttsx3 always runs locally (it cannot stream, so its time to first audio
+is its total time).
+"""
+import argparse
+import asyncio
+import base64
+import html
+import json
+import os
+import re
+import socket
+import sys
+import tempfile
+import threading
+import time
+import wave
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+from bench_common import PHRASES, environment, summarize
+
+ENGINES = ('gtts', 'edge-tts', 'pyttsx3')
+LANGUAGES = ('fr', 'en', 'ar')
+LENGTHS = {'short': 40, 'medium': 200, 'long': 800}  # characters
+EDGE_VOICES = {'fr': 'fr-FR-DeniseNeural', 'en': 'en-US-AriaNeural', 'ar': 'ar-SA-ZariyahNeural'}
+
+SPEAKING_RATE = 14.0  # characters per second of speech, used by the stand-ins
+EDGE_CHUNK_FRAMES = 24  # MP3 frames per WebSocket audio message (~0.6 s)
+PROXY_VARIABLES = ('http_proxy', 'https_proxy', 'all_proxy', 'HTTP_PROXY', 'HTTPS_PROXY', 'ALL_PROXY')
+
+# MPEG audio Layer III tables, indexed by the header fields
+_BITRATES = {
+    1: [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],  # MPEG-1
+    2: [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],  # MPEG-2 / 2.5
+}
+_SAMPLE_RATES = {3: (44100, 48000, 32000), 2: (22050, 24000, 16000), 0: (11025, 12000, 8000)}
+
+
+# ==========================================
+# AUDIO HELPERS
+# ==========================================
+
+def silent_mp3(seconds, bitrate=48, sample_rate=24000):
+    """Silent MPEG-2 Layer III mono frames, the format both online engines return"""
+    bitrate_index = _BITRATES[2].index(bitrate)
+    rate_index = _SAMPLE_RATES[2].index(sample_rate)
+    header = bytes([0xFF, 0xF3, (bitrate_index << 4) | (rate_index << 2), 0xC0])
+    frame = header + bytes(72 * bitrate * 1000 // sample_rate - len(header))
+    return frame * max(1, round(seconds * sample_rate / 576))
+
+
+def mp3_duration(data):
+    """Duration in seconds of MP3 data, by walking its Layer III frame headers"""
+    pos = 0
+    if data[:3] == b'ID3' and len(data) >= 10:
+        pos = 10 + ((data[6] & 0x7F) << 21 | (data[7] & 0x7F) << 14 | (data[8] & 0x7F) << 7 | data[9] & 0x7F)
+    seconds = 0.0
+    while pos + 4 <= len(data):
+        b1, b2 = data[pos + 1], data[pos + 2]
+        version = (b1 >> 3) & 0x3  # 3: MPEG-1, 2: MPEG-2, 0: MPEG-2.5
+        layer = (b1 >> 1) & 0x3  # 1: Layer III
+        bitrate_index, rate_index, padding = b2 >> 4, (b2 >> 2) & 0x3, (b2 >> 1) & 0x1
+        if (data[pos] != 0xFF or b1 & 0xE0 != 0xE0 or version == 1 or layer != 1
+                or bitrate_index in (0, 15) or rate_index == 3):
+            pos += 1  # not a frame header, resynchronize
+            continue
+        sample_rate = _SAMPLE_RATES[version][rate_index]
+        bitrate = _BITRATES[1 if version == 3 else 2][bitrate_index] * 1000
+        samples = 1152 if version == 3 else 576
+        seconds += samples / sample_rate
+        pos += samples // 8 * bitrate // sample_rate + padding
+    return seconds
+
+
+def wav_duration(path):
+    with wave.open(str(path), 'rb') as wav:
+        return wav.getnframes() / wav.getframerate()
+
+
+def make_text(lang, length):
+    """Deterministic test text of about `length` characters in one language"""
+    phrases = [p for p in PHRASES[lang] if p and '@' not in p]
+    words, i = [], 0
+    while len(' '.join(words)) < length:
+        words.append(phrases[i % len(phrases)])
+        i += 1
+    return ' '.join(words)
+
+
+# ==========================================
+# LOCAL STAND-IN SERVICES
+# ==========================================
+
+def _rpc_text(body):
+    """Text of a gTTS batchexecute request body"""
+    rpc = json.loads(parse_qs(body)['f.req'][0])
+    return json.loads(rpc[0][0][1])[0]
+
+
+class _GoogleStandIn(BaseHTTPRequestHandler):
+    """translate.google.com batchexecute endpoint answering with silent audio"""
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0))).decode('utf-8')
+        seconds = len(_rpc_text(body)) / SPEAKING_RATE
+        # The real service answers once the whole part is synthesized
+        time.sleep(self.server.latency + self.server.rtf * seconds)
+        audio = base64.b64encode(silent_mp3(seconds, bitrate=32)).decode('ascii')
+        reply = f')]}}\'\n\n[["wrb.fr","jQ1olc","[\\"{audio}\\"]",null,null,null,"generic"]]\n'.encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(reply)))
+        self.end_headers()
+        self.wfile.write(reply)
+
+    def log_message(self, *args):
+        pass
+
+
+def _edge_message(request_id, path, body='{}'):
+    return f"X-RequestId:{request_id}\r\nContent-Type:application/json; charset=utf-8\r\nPath:{path}\r\n\r\n{body}"
+
+
+class StandInServices:
+    """Local gTTS and edge-tts endpoints; patches both libraries while active.
+
+        with StandInServices(latency=0.08, rtf=0.05):
+            gTTS(text, lang='fr').save(...)   # talks to 127.0.0.1
+    """
+
+    def __init__(self, latency=0.08, rtf=0.05):
+        self.latency = latency
+        self.rtf = rtf
+        self._restore = []
+
+    def __enter__(self):
+        # Local traffic must not go through a proxy
+        self._proxies = {name: os.environ.pop(name) for name in PROXY_VARIABLES if name in os.environ}
+        try:
+            import gtts.tts
+        except ImportError:
+            pass
+        else:
+            self._google = ThreadingHTTPServer(('127.0.0.1', 0), _GoogleStandIn)
+            self._google.latency, self._google.rtf = self.latency, self.rtf
+            threading.Thread(target=self._google.serve_forever, name='gtts-stand-in', daemon=True).start()
+            url = f'http://127.0.0.1:{self._google.server_port}/'
+            self._patch(gtts.tts, '_translate_url', lambda tld='com', path='': url + path)
+        try:
+            import edge_tts.communicate
+        except ImportError:
+            pass
+        else:
+            port = self._start_edge()
+            self._patch(edge_tts.communicate, 'WSS_URL', f'ws://127.0.0.1:{port}/edge/v1?TrustedClientToken=local')
+        return self
+
+    def __exit__(self, *exc):
+        for module, name, value in reversed(self._restore):
+            setattr(module, name, value)
+        self._restore = []
+        if hasattr(self, '_google'):
+            self._google.shutdown()
+            self._google.server_close()
+        if hasattr(self, '_edge_loop'):
+            self._edge_loop.call_soon_threadsafe(self._edge_loop.stop)
+            self._edge_thread.join()
+        os.environ.update(self._proxies)
+        return False
+
+    def _patch(self, module, name, value):
+        self._restore.append((module, name, getattr(module, name)))
+        setattr(module, name, value)
+
+    def _start_edge(self):
+        from aiohttp import web
+
+        async def handler(request):
+            ws = web.WebSocketResponse()
+            await ws.prepare(request)
+            async for message in ws:
+                if not isinstance(message.data, str) or 'Path:ssml' not in message.data:
+                    continue  # speech.config
+                headers, _, ssml = message.data.partition('\r\n\r\n')
+                request_id = re.search(r'X-RequestId:(\w+)', headers).group(1)
+                text = html.unescape(re.sub(r'<[^>]+>', '', ssml)).strip()
+                await ws.send_str(_edge_message(request_id, 'turn.start'))
+                await asyncio.sleep(self.latency)
+                audio = silent_mp3(len(text) / SPEAKING_RATE, bitrate=48)
+                header = f"X-RequestId:{request_id}\r\nContent-Type:audio/mpeg\r\nPath:audio\r\n".encode()
+                step = EDGE_CHUNK_FRAMES * 144  # 144 bytes per 48 kbps / 24 kHz frame
+                try:
+                    for start in range(0, len(audio), step):
+                        chunk = audio[start:start + step]
+                        # Audio is streamed as it is synthesized
+                        await asyncio.sleep(self.rtf * len(chunk) / 144 * 0.024)
+                        await ws.send_bytes(len(header).to_bytes(2, 'big') + header + chunk)
+                    await ws.send_str(_edge_message(request_id, 'turn.end'))
+                except ConnectionResetError:
+                    break  # client stopped listening
+            return ws
+
+        app = web.Application()
+        app.router.add_get('/edge/v1', handler)
+        sock = socket.socket()
+        sock.bind(('127.0.0.1', 0))
+        ready = threading.Event()
+        self._edge_loop = asyncio.new_event_loop()
+
+        def serve():
+            loop = self._edge_loop
+            asyncio.set_event_loop(loop)
+            runner = web.AppRunner(app)
+            loop.run_until_complete(runner.setup())
+            loop.run_until_complete(web.SockSite(runner, sock).start())
+            ready.set()
+            loop.run_forever()
+            loop.run_until_complete(runner.cleanup())
+            loop.close()
+
+        self._edge_thread = threading.Thread(target=serve, name='edge-tts-stand-in', daemon=True)
+        self._edge_thread.start()
+        ready.wait()
+        return sock.getsockname()[1]
+
+
+# ==========================================
+# ENGINES
+# ==========================================
+
+class GTTSSynth:
+    """gTTS: one HTTP request per ~100 character part, audio of a part arrives whole"""
+    streaming = True
+
+    def load(self):
+        from gtts import gTTS
+        self._gtts = gTTS
+
+    def synthesize(self, text, lang):
+        start = time.perf_counter()
+        first, audio = None, bytearray()
+        for chunk in self._gtts(text=text, lang=lang).stream():
+            if first is None:
+                first = time.perf_counter() - start
+            audio += chunk
+        return first, time.perf_counter() - start, mp3_duration(bytes(audio)), len(audio)
+
+    def close(self):
+        pass
+
+
+class EdgeSynth:
+    """edge-tts: one WebSocket per text, audio streamed in small chunks"""
+    streaming = True
+
+    def load(self):
+        import edge_tts  # noqa: F401  (fail here, not in the first timed run)
+        from tts_stream import StreamingSpeaker
+        # One loop for the whole run, so loop creation is not counted per text
+        self.speaker = StreamingSpeaker()
+
+    def synthesize(self, text, lang):
+        start = time.perf_counter()
+        first, audio = None, bytearray()
+        for chunk in self.speaker.stream(text, EDGE_VOICES[lang]):
+            if first is None:
+                first = time.perf_counter() - start
+            audio += chunk
+        return first, time.perf_counter() - start, mp3_duration(bytes(audio)), len(audio)
+
+    def close(self):
+        self.speaker.close()
+
+
+class Pyttsx3Synth:
+    """pyttsx3: offline system voices, renders the whole file before returning"""
+    streaming = False
+
+    def load(self):
+        import pyttsx3
+        self.engine = pyttsx3.init()
+        self.engine.setProperty('rate', 150)
+        self.voices = self.engine.getProperty('voices')
+        self._dir = tempfile.mkdtemp(prefix='tts_bench_')
+
+    def _select_voice(self, lang):
+        for voice in self.voices:
+            languages = [l.decode(errors='ignore') if isinstance(l, bytes) else str(l)
+                         for l in getattr(voice, 'languages', []) or []]
+            if any(lang in l.lower() for l in languages) or lang in voice.id.lower():
+                self.engine.setProperty('voice', voice.id)
+                return
+
+    def synthesize(self, text, lang):
+        self._select_voice(lang)
+        path = os.path.join(self._dir, 'bench.wav')
+        start = time.perf_counter()
+        self.engine.save_to_file(text, path)
+        self.engine.runAndWait()
+        total = time.perf_counter() - start
+        return total, total, wav_duration(path), os.path.getsize(path)
+
+    def close(self):
+        self.engine.stop()
+
+
+SYNTHS = {'gtts': GTTSSynth, 'edge-tts': EdgeSynth, 'pyttsx3': Pyttsx3Synth}
+
+
+# ==========================================
+# BENCHMARK
+# ==========================================
+
+def benchmark_tts(name, languages=LANGUAGES, lengths=LENGTHS, warmup=1, repeats=5):
+    """TTFA / total / RTF of one engine for every language x text length"""
+    synth = SYNTHS[name]()
+    start = time.perf_counter()
+    synth.load()
+    result = {'engine': name, 'streaming': synth.streaming, 'load_time': time.perf_counter() - start, 'cases': {}}
+    try:
+        for lang in languages:
+            for label, length in lengths.items():
+                text = make_text(lang, length)
+                for _ in range(warmup):
+                    synth.synthesize(text, lang)
+                ttfa, total, rtf = [], [], []
+                for _ in range(repeats):
+                    first, elapsed, audio_seconds, size = synth.synthesize(text, lang)
+                    ttfa.append(first)
+                    total.append(elapsed)
+                    rtf.append(elapsed / audio_seconds if audio_seconds else float('inf'))
+                result['cases'].setdefault(lang, {})[label] = {
+                    'chars': len(text),
+                    'audio_seconds': audio_seconds,
+                    'bytes': size,
+                    'ttfa': summarize(ttfa),
+                    'total': summarize(total),
+                    'rtf': summarize(rtf),
+                }
+    finally:
+        synth.close()
+    return result
+
+
+def run_suite(engines=ENGINES, languages=LANGUAGES, lengths=LENGTHS, warmup=1, repeats=5,
+              online=False, latency=0.08, rtf=0.05):
+    results = {}
+    services = None if online else StandInServices(latency, rtf)
+    if services:
+        services.__enter__()
+    try:
+        for name in engines:
+            print(f"▶ {name}...", flush=True)
+            try:
+                results[name] = benchmark_tts(name, languages, lengths, warmup, repeats)
+            except Exception as e:
+                print(f"❌ {name}: {e}")
+                results[name] = {'engine': name, 'error': f'{type(e).__name__}: {e}'}
+    finally:
+        if services:
+            services.__exit__(None, None, None)
+    return results
+
+
+def print_results(results):
+    print(f"\n{'Engine':<10} {'Lang':<5} {'Length':<8} {'Chars':>6} {'Audio s':>8} "
+          f"{'TTFA ms':>9} {'Total ms':>9} {'RTF':>7}")
+    print("-" * 70)
+    for name, result in results.items():
+        if 'error' in result:
+            print(f"{name:<10} ERROR: {result['error']}")
+            continue
+        for lang, cases in result['cases'].items():
+            for label, case in cases.items():
+                print(f"{name:<10} {lang:<5} {label:<8} {case['chars']:>6} {case['audio_seconds']:>8.2f} "
+                      f"{case['ttfa']['median'] * 1000:>9.1f} {case['total']['median'] * 1000:>9.1f} "
+                      f"{case['rtf']['median']:>7.3f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="TTS latency benchmark (offline by default)")
+    parser.add_argument('--engines', nargs='+', default=list(ENGINES), choices=list(SYNTHS))
+    parser.add_argument('--languages', nargs='+', default=list(LANGUAGES), choices=list(LANGUAGES))
+    parser.add_argument('--lengths', nargs='+', default=list(LENGTHS), choices=list(LENGTHS))
+    parser.add_argument('--warmup', type=int, default=1)
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--online', action='store_true', help="use the real gTTS / edge-tts services")
+    parser.add_argument('--server-latency', type=float, default=0.08,
+                        help="stand-in servers: seconds before the first audio byte")
+    parser.add_argument('--server-rtf', type=float, default=0.05,
+                        help="stand-in servers: synthesis seconds per second of audio")
+    parser.add_argument('--output', help="JSON results file")
+    args = parser.parse_args(argv)
+
+    lengths = {label: LENGTHS[label] for label in args.lengths}
+    results = run_suite(args.engines, args.languages, lengths, args.warmup, args.repeats,
+                        args.online, args.server_latency, args.server_rtf)
+    print_results(results)
+
+    if args.output:
+        env = environment(('gtts', 'edge_tts', 'pyttsx3'))
+        report = {
+            'date': datetime.now().isoformat(timespec='seconds'),
+            'environment': env,
+            'config': {
+                'online': args.online,
+                'server_latency': None if args.online else args.server_latency,
+                'server_rtf': None if args.online else args.server_rtf,
+                'warmup': args.warmup,
+                'repeats': args.repeats,
+            },
+            'results': results,
+        }
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 Résultats : {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
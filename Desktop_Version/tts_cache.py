@@ -0,0 +1,221 @@
+"""Content-addressed cache of synthesized speech, shared between processes.
+
+Audio is stored once per (engine, voice, rate, language, normalized text)
+under the SHA-256 of those fields, so the app, TTS.py and the server can
+all reuse each other's audio:
+
+    cache = TTSCache()
+    key = cache_key('pyttsx3', voice_id, 150, 'fr', text)
+    path = cache.get(key)                      # None on a miss
+    path = cache.get_or_create(key, '.wav', lambda tmp: render_to(tmp))
+
+Files appear atomically (written to a temporary file, then os.replace),
+so readers never need a lock. Commits and evictions take an inter-process
+file lock. File modification times serve as the shared LRU clock: a hit
+touches the file, and eviction removes the least recently used files
+until the directory fits in the byte budget.
+"""
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+DEFAULT_DIR = Path(tempfile.gettempdir()) / 'visionspeak_tts_cache'
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+LOCK_NAME = '.lock'
+
+
+def normalize_text(text):
+    """Canonical form of a text for keying: NFC, single spaces, trimmed"""
+    return re.sub(r'\s+', ' ', unicodedata.normalize('NFC', text)).strip()
+
+
+def cache_key(engine, voice, rate, lang, text):
+    """SHA-256 key of everything that changes the synthesized audio"""
+    fields = [engine, voice or '', str(rate or ''), lang or '', normalize_text(text)]
+    return hashlib.sha256(json.dumps(fields, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+class _FileLock:
+    """Exclusive lock shared by every process using the same cache directory"""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.Lock()
+
+    def __enter__(self):
+        self._local.acquire()
+        self._file = open(self.path, 'a+b')
+        if fcntl:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        else:
+            self._file.seek(0)
+            msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+        return self
+
+    def __exit__(self, *exc):
+        try:
+            if fcntl:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            else:
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            self._file.close()
+            self._local.release()
+        return False
+
+
+class TTSCache:
+    """Disk cache of encoded audio with an in-memory LRU index and a byte budget"""
+
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = Path(directory) if directory else DEFAULT_DIR
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = _FileLock(self.directory / LOCK_NAME)
+        self._index = OrderedDict()  # key -> (path, size), least recently used first
+        self._index_lock = threading.Lock()
+        self._rescan()
+
+    def _entries(self):
+        """(mtime, size, key, path) of every cached file on disk"""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.startswith('.') or not entry.is_file():
+                continue  # lock and in-progress temporary files
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue  # evicted by another process meanwhile
+            entries.append((stat.st_mtime, stat.st_size, entry.name.split('.')[0], Path(entry.path)))
+        entries.sort()
+        return entries
+
+    def _rescan(self):
+        entries = self._entries()
+        with self._index_lock:
+            self._index = OrderedDict((key, (path, size)) for _, size, key, path in entries)
+        return entries
+
+    def get(self, key):
+        """Path of the cached audio for key, or None"""
+        with self._index_lock:
+            entry = self._index.get(key)
+        if entry is None:
+            # Another process may have added it since we last looked
+            for match in self.directory.glob(f'{key}.*'):
+                try:
+                    entry = (match, match.stat().st_size)
+                    break
+                except FileNotFoundError:
+                    continue  # evicted by another process meanwhile
+        if entry is not None:
+            path = entry[0]
+            try:
+                os.utime(path)  # mark as recently used for every process
+            except FileNotFoundError:
+                entry = None  # evicted by another process
+        with self._index_lock:
+            if entry is None:
+                self._index.pop(key, None)
+                self.misses += 1
+                return None
+            self._index[key] = entry
+            self._index.move_to_end(key)
+            self.hits += 1
+        return entry[0]
+
+    def get_or_create(self, key, ext, render):
+        """Cached path for key, calling render(tmp_path) to create it on a miss.
+
+        Rendering runs without the lock, so several processes can synthesize
+        at once; if two render the same key the last identical file wins.
+        """
+        path = self.get(key)
+        if path is not None:
+            return path
+        return self._store(key, ext, render)
+
+    def put(self, key, data, ext):
+        """Store encoded audio bytes under key and return the cached path"""
+        def write(tmp):
+            with open(tmp, 'wb') as f:
+                f.write(data)
+        return self._store(key, ext, write)
+
+    def put_file(self, key, source, ext=None):
+        """Copy an existing audio file into the cache"""
+        with open(source, 'rb') as f:
+            return self.put(key, f.read(), ext or Path(source).suffix)
+
+    def _store(self, key, ext, render):
+        # Same directory as the final file, so os.replace is atomic
+        fd, tmp = tempfile.mkstemp(prefix=f'.{key}.', suffix=ext, dir=self.directory)
+        os.close(fd)
+        try:
+            render(tmp)
+            if os.path.getsize(tmp) == 0:
+                raise RuntimeError("TTS engine produced no audio")
+            path = self.directory / f'{key}{ext}'
+            with self._lock:
+                os.replace(tmp, path)
+                with self._index_lock:
+                    self._index[key] = (path, path.stat().st_size)
+                    self._index.move_to_end(key)
+                self._evict(keep=key)
+            return path
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    def _evict(self, keep=None):
+        """Remove least recently used files until the cache fits the budget (lock held)"""
+        entries = self._rescan()
+        total = sum(size for _, size, _, _ in entries)
+        for _, size, key, path in entries:
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError:
+                continue  # open by a reader on Windows; try again next time
+            total -= size
+            with self._index_lock:
+                self._index.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            for _, _, _, path in self._entries():
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self._rescan()
+
+    def stats(self):
+        with self._index_lock:
+            return {
+                'entries': len(self._index),
+                'bytes': sum(size for _, size in self._index.values()),
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
@@ -0,0 +1,134 @@
+"""Streaming edge-tts synthesis.
+
+Audio is handed out chunk by chunk as the service sends it, so playback
+can start after the first chunk instead of after the whole utterance.
+Many texts (e.g. the pages of a document) are synthesized concurrently
+on one event loop, at most `max_concurrent` at a time, and their chunks
+come out in text order: text 0 streams live while the following texts
+are already being buffered. With a TTSCache, texts already synthesized
+with the same voice and rate are read back from disk instead.
+
+    speaker = StreamingSpeaker()
+    for chunk in speaker.stream("Bonjour", voice='fr-FR-DeniseNeural'):
+        player.feed(chunk)
+    for index, chunk in speaker.synthesize_many(pages):
+        ...
+    speaker.close()
+"""
+import asyncio
+import threading
+
+DEFAULT_VOICE = 'en-US-AriaNeural'
+MAX_CONCURRENT = 4
+CHUNK_SIZE = 4096  # bytes per chunk when replaying cached audio
+
+_END = object()
+
+
+async def stream_speech(text, voice=DEFAULT_VOICE, rate='+0%'):
+    """Yield the MP3 chunks of one text as they arrive"""
+    import edge_tts
+    async for message in edge_tts.Communicate(text, voice, rate=rate).stream():
+        if message['type'] == 'audio':
+            yield message['data']
+
+
+async def synthesize_many(texts, voice=DEFAULT_VOICE, rate='+0%', max_concurrent=MAX_CONCURRENT):
+    """Yield (text index, MP3 chunk) for every text, in text order.
+
+    All texts are scheduled at once; a semaphore keeps at most
+    max_concurrent connections open. An error in one text is raised when
+    the output reaches that text.
+    """
+    limit = asyncio.Semaphore(max_concurrent)
+    queues = [asyncio.Queue() for _ in texts]
+
+    async def produce(text, out):
+        try:
+            async with limit:
+                async for chunk in stream_speech(text, voice, rate):
+                    out.put_nowait(chunk)
+            out.put_nowait(_END)
+        except Exception as e:
+            out.put_nowait(e)
+
+    tasks = [asyncio.create_task(produce(text, out)) for text, out in zip(texts, queues)]
+    try:
+        for index, out in enumerate(queues):
+            while True:
+                item = await out.get()
+                if item is _END:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield index, item
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+class StreamingSpeaker:
+    """Synchronous front end: one event loop on a background thread for all requests"""
+
+    def __init__(self, voice=DEFAULT_VOICE, rate='+0%', max_concurrent=MAX_CONCURRENT, cache=None):
+        self.voice = voice
+        self.rate = rate
+        self.max_concurrent = max_concurrent
+        self.cache = cache
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name='tts-stream', daemon=True)
+        self._thread.start()
+
+    def _iterate(self, agen):
+        """Pull an async generator from the loop thread, one item at a time"""
+        try:
+            while True:
+                try:
+                    yield asyncio.run_coroutine_threadsafe(agen.__anext__(), self._loop).result()
+                except StopAsyncIteration:
+                    return
+        finally:
+            # Stopping early closes the connections of the remaining texts
+            asyncio.run_coroutine_threadsafe(agen.aclose(), self._loop).result()
+
+    def stream(self, text, voice=None):
+        """MP3 chunks of one text, as they arrive"""
+        voice = voice or self.voice
+        if self.cache is None:
+            return self._iterate(stream_speech(text, voice, self.rate))
+        return self._cached_stream(text, voice)
+
+    def _cached_stream(self, text, voice):
+        from tts_cache import cache_key
+        key = cache_key('edge-tts', voice, self.rate, None, text)
+        path = self.cache.get(key)
+        if path is not None:
+            with open(path, 'rb') as f:
+                while True:
+                    chunk = f.read(CHUNK_SIZE)
+                    if not chunk:
+                        return
+                    yield chunk
+        audio = bytearray()
+        for chunk in self._iterate(stream_speech(text, voice, self.rate)):
+            audio += chunk
+            yield chunk
+        # Only reached when the whole utterance was received
+        self.cache.put(key, bytes(audio), '.mp3')
+
+    def synthesize_many(self, texts, voice=None, max_concurrent=None):
+        """(text index, MP3 chunk) for many texts synthesized concurrently, in text order"""
+        return self._iterate(synthesize_many(list(texts), voice or self.voice, self.rate,
+                                             max_concurrent or self.max_concurrent))
+
+    def save(self, text, path, voice=None):
+        """Write one text to an MP3 file, chunk by chunk"""
+        with open(path, 'wb') as f:
+            for chunk in self.stream(text, voice):
+                f.write(chunk)
+
+    def close(self):
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
@@ -1,11 +1,38 @@
 from flask import Flask, request, jsonify
-from PIL import Image
-import easyocr
 import io
+import os
+import sys
+import threading
+
+# Shared with the desktop app
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Desktop_Version'))
+from resource_governor import ResourceGovernor
+
+# Thread settings must be in place before numpy and torch load their
+# BLAS/OpenMP runtimes, so those imports come after this
+governor = ResourceGovernor.from_env(reserve=0)
+governor.apply_env()
+governor.pin()
+
 import numpy as np
+from PIL import Image
+import easyocr  # noqa: F401 - torch is imported here, after the thread settings
+from ocr_int8 import create_reader
+
+governor.apply_torch()
+governor.apply_opencv()
+print(governor.report())
 
 app = Flask(__name__)
-reader = easyocr.Reader(['en'], gpu=False)
+# Same languages as the desktop app by default, so it can offload captures here
+OCR_LANGS = [lang.strip() for lang in os.environ.get('VISIONSPEAK_OCR_LANGS', 'en,fr').split(',') if lang.strip()]
+# VISIONSPEAK_OCR_INT8=1 selects the quantized int8 models
+reader = create_reader(OCR_LANGS, gpu=False)
+print(f"OCR languages: {OCR_LANGS}")
+print(f"OCR models: {'int8 (ONNX Runtime)' if hasattr(reader, 'int8') else 'fp32 (PyTorch)'}")
+
+# Flask serves requests on many threads; only ocr_workers may run OCR at once
+ocr_slots = threading.BoundedSemaphore(governor.plan['ocr_workers'])
 
 @app.route('/ocr', methods=['POST'])
 def ocr():
@@ -17,7 +44,27 @@ def ocr():
             img = img.convert('RGB')
         
         img_array = np.array(img)
-        result = reader.readtext(img_array, detail=0)
+        
+        # Clients that send their languages only accept results from the same model
+        langs = request.form.get('langs')
+        if langs and set(langs.split(',')) != set(OCR_LANGS):
+            return jsonify({'text': f"Error: server reads {','.join(OCR_LANGS)}, client expects {langs}",
+                            'langs': OCR_LANGS}), 409
+        
+        # detail=1 (desktop offload) also returns boxes and confidences
+        if request.form.get('detail') == '1':
+            with ocr_slots:
+                detections = reader.readtext(img_array, detail=1)
+            text = ' '.join(t for (_, t, _) in detections)
+            results = [
+                ([[int(x), int(y)] for (x, y) in bbox], t, float(conf))
+                for (bbox, t, conf) in detections
+            ]
+            print(f"OCR Result: {text}")  # Debug output
+            return jsonify({'text': text, 'results': results})
+        
+        with ocr_slots:
+            result = reader.readtext(img_array, detail=0)
         text = ' '.join(result)
         
         print(f"OCR Result: {text}")  # Debug output
@@ -28,4 +75,5 @@ def ocr():
         return jsonify({'text': f'Error: {str(e)}'})
 
 if __name__ == '__main__':
-    app.run(host='192.168.1.16', port=5000)
+    # threaded=True keeps HTTP/1.1 keep-alive connections from clients open
+    app.run(host='192.168.1.16', port=5000, threaded=True)